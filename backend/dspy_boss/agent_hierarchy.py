@@ -4,17 +4,56 @@ Agent Hierarchy - Manages Boss (Agent 0) and subordinate agents with proper numb
 """
 
 import asyncio
-import uuid
-from typing import Dict, List, Optional, Any
+import bisect
+import functools
+import json
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 from datetime import datetime
 from loguru import logger
 from dataclasses import dataclass
-from enum import Enum
+from enum import Enum, IntEnum
+from concurrent.futures import ThreadPoolExecutor
 
-import dspy
 from dspy import Signature, InputField, OutputField, ChainOfThought
 
-from .models import AgentConfig, AgentType, AgentRoleType, AgentHierarchyLevel, TaskDefinition
+
+# Shared pool for blocking LM calls so agents can run concurrently
+_LM_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="dspy-lm")
+
+
+# Simple capability assignment - in production this would be more sophisticated.
+# Capability sets are frozen tuples shared by every agent of the same kind.
+_BASE_CAPS = ("task_execution", "problem_solving", "data_processing")
+_TRADING_CAPS = (*_BASE_CAPS, "market_analysis", "order_execution", "risk_management")
+_ANALYSIS_CAPS = (*_BASE_CAPS, "data_analysis", "pattern_recognition", "reporting")
+_RESEARCH_CAPS = (*_BASE_CAPS, "web_research", "information_gathering", "summarization")
+_COMMUNICATION_CAPS = (*_BASE_CAPS, "message_processing", "notification_handling", "user_interaction")
+_GENERAL_CAPS = (*_BASE_CAPS, "general_purpose", "adaptable_execution")
+_BOSS_CAPS = (
+    "strategic_decision_making",
+    "task_delegation",
+    "system_orchestration",
+    "agent_management",
+    "priority_assessment",
+    "resource_allocation"
+)
+_CAP_TABLE = (
+    ("trading", _TRADING_CAPS),
+    ("analysis", _ANALYSIS_CAPS),
+    ("research", _RESEARCH_CAPS),
+    ("communication", _COMMUNICATION_CAPS),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _capabilities_for_name(agent_name: str) -> Tuple[str, ...]:
+    """Match agent name keywords against the capability table in one pass"""
+    name_lower = agent_name.lower()
+    for keyword, capabilities in _CAP_TABLE:
+        if keyword in name_lower:
+            return capabilities
+    return _GENERAL_CAPS
 
 
 class AgentRole(str, Enum):
@@ -22,17 +61,25 @@ class AgentRole(str, Enum):
     SUBORDINATE = "subordinate"  # Agent 1, 2, 3, etc.
 
 
-@dataclass
+class AgentStatus(IntEnum):
+    """Internal agent status - ordered so IDLE/ACTIVE are the available range"""
+    IDLE = 0
+    ACTIVE = 1
+    BUSY = 2
+    ERROR = 3
+
+
+@dataclass(slots=True)
 class AgentInfo:
     agent_id: int          # 0 for boss, 1, 2, 3... for subordinates
-    agent_name: str        # Human readable name
+    agent_name: Optional[str]  # Human readable name, None when auto-generated
     role: AgentRole
-    status: str           # "active", "idle", "busy", "error"
+    status: AgentStatus   # Serialized as lowercase name
     current_tasks: List[str]
     completed_tasks: int
     created_at: datetime
-    last_active: datetime
-    capabilities: List[str]
+    last_active: float     # Epoch seconds, formatted only when serialized
+    capabilities: Tuple[str, ...]
     performance_score: float
 
 
@@ -51,11 +98,26 @@ class SubordinateAgentSignature(Signature):
 class AutonomousAgent:
     """Individual autonomous agent powered by DSPY"""
     
-    def __init__(self, agent_info: AgentInfo):
+    __slots__ = (
+        "info", "_on_state_change", "is_busy", "current_task", "_capabilities_str",
+        "_status_cache", "_status_dirty", "_created_monotonic"
+    )
+    
+    # One predictor shared by every agent - nothing in it varies per agent
+    _shared_predictor = ChainOfThought(SubordinateAgentSignature)
+    
+    def __init__(self, agent_info: AgentInfo,
+                 on_state_change: Optional[Callable[["AutonomousAgent"], None]] = None):
         self.info = agent_info
-        self.signature = ChainOfThought(SubordinateAgentSignature)
+        self._on_state_change = on_state_change
         self.is_busy = False
         self.current_task: Optional[str] = None
+        self._capabilities_str = ", ".join(agent_info.capabilities)
+        
+        # Cached status snapshot, rebuilt only after a state transition
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_dirty = True
+        self._created_monotonic = time.monotonic()
         
     async def execute_task(self, task: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute a task autonomously"""
@@ -64,25 +126,36 @@ class AutonomousAgent:
             
         self.is_busy = True
         self.current_task = task
-        self.info.last_active = datetime.now()
+        self.info.last_active = time.time()
+        self._state_changed()
         
         try:
-            logger.info(f"🤖 Agent {self.info.agent_id} ({self.info.agent_name}) executing task: {task}")
+            logger.opt(lazy=True).info(
+                "🤖 Agent {} ({}) executing task: {}",
+                lambda: self.info.agent_id, lambda: self.name, lambda: task
+            )
             
-            # Use DSPY signature to execute task
-            result = self.signature(
-                task_description=task,
-                context=str(context or {}),
-                agent_capabilities=", ".join(self.info.capabilities)
+            # Use DSPY signature to execute task (in thread pool to avoid blocking)
+            context_str = json.dumps(context, default=str) if context else "{}"
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                _LM_EXECUTOR,
+                functools.partial(
+                    type(self)._shared_predictor,
+                    task_description=task,
+                    context=context_str,
+                    agent_capabilities=self._capabilities_str
+                )
             )
             
             # Update agent stats
             self.info.completed_tasks += 1
-            self.info.status = "idle"
+            self.info.status = AgentStatus.IDLE
+            self._state_changed()
             
             task_result = {
                 "agent_id": self.info.agent_id,
-                "agent_name": self.info.agent_name,
+                "agent_name": self.name,
                 "task": task,
                 "result": result.result,
                 "status": result.status,
@@ -92,15 +165,16 @@ class AutonomousAgent:
                 "success": True
             }
             
-            logger.info(f"✅ Agent {self.info.agent_id} completed task successfully")
+            logger.debug("✅ Agent {} completed task successfully", self.info.agent_id)
             return task_result
             
         except Exception as e:
             logger.error(f"❌ Agent {self.info.agent_id} failed task: {e}")
-            self.info.status = "error"
+            self.info.status = AgentStatus.ERROR
+            self._state_changed()
             return {
                 "agent_id": self.info.agent_id,
-                "agent_name": self.info.agent_name,
+                "agent_name": self.name,
                 "task": task,
                 "error": str(e),
                 "success": False,
@@ -110,21 +184,46 @@ class AutonomousAgent:
         finally:
             self.is_busy = False
             self.current_task = None
+            self._state_changed()
+            
+    @property
+    def name(self) -> str:
+        """Agent name, formatted from the id for auto-generated agents"""
+        return self.info.agent_name or f"Agent {self.info.agent_id}"
+        
+    def set_capabilities(self, capabilities: List[str]):
+        """Replace agent capabilities and refresh the cached prompt string"""
+        self.info.capabilities = tuple(capabilities)
+        self._capabilities_str = ", ".join(capabilities)
+        self._state_changed()
+            
+    def _state_changed(self):
+        """Invalidate the status snapshot and notify the owning hierarchy"""
+        self._status_dirty = True
+        if self._on_state_change:
+            self._on_state_change(self)
             
     def get_status(self) -> Dict[str, Any]:
         """Get agent status"""
-        return {
+        if not self._status_dirty and self._status_cache is not None:
+            status = self._status_cache.copy()
+            status["uptime"] = time.monotonic() - self._created_monotonic
+            return status
+            
+        self._status_cache = {
             "agent_id": self.info.agent_id,
-            "agent_name": self.info.agent_name,
+            "agent_name": self.name,
             "role": self.info.role.value,
-            "status": "busy" if self.is_busy else self.info.status,
+            "status": "busy" if self.is_busy else self.info.status.name.lower(),
             "current_task": self.current_task,
             "completed_tasks": self.info.completed_tasks,
             "capabilities": self.info.capabilities,
             "performance_score": self.info.performance_score,
-            "last_active": self.info.last_active.isoformat(),
-            "uptime": (datetime.now() - self.info.created_at).total_seconds()
+            "last_active": datetime.fromtimestamp(self.info.last_active),  # Stringified at JSON egress
+            "uptime": time.monotonic() - self._created_monotonic
         }
+        self._status_dirty = False
+        return self._status_cache.copy()
 
 
 class AgentHierarchy:
@@ -133,7 +232,21 @@ class AgentHierarchy:
     def __init__(self):
         self.agents: Dict[int, AutonomousAgent] = {}
         self.next_agent_id = 1  # Boss is 0, subordinates start from 1
-        self.boss_agent: Optional[AutonomousAgent] = None
+        self._id_lock = asyncio.Lock()  # Guards next_agent_id allocation only
+        
+        # Indexes kept in sync with agent state so queries avoid full scans
+        self._by_role: Dict[AgentRole, Set[int]] = {role: set() for role in AgentRole}
+        self._by_status: Dict[AgentStatus, Set[int]] = {status: set() for status in AgentStatus}
+        self._busy_agents: Set[int] = set()
+        self._available_agents: Set[int] = set()
+        self._idle_subordinates: Set[int] = set()
+        self._subordinate_count = 0
+        self._name_to_id: Dict[str, int] = {}  # Subordinate names only
+        self._sorted_ids: List[int] = []  # Agent ids in display order
+        
+        # Bumped on every agent state change so derived views can be memoized
+        self._hierarchy_version = 0
+        self._rec_cache: Optional[Tuple[int, List[str]]] = None
         
         # Create the Boss (Agent 0)
         self._create_boss_agent()
@@ -144,107 +257,155 @@ class AgentHierarchy:
             agent_id=0,
             agent_name="Boss Agent",
             role=AgentRole.BOSS,
-            status="active",
+            status=AgentStatus.ACTIVE,
             current_tasks=[],
             completed_tasks=0,
             created_at=datetime.now(),
-            last_active=datetime.now(),
-            capabilities=[
-                "strategic_decision_making",
-                "task_delegation",
-                "system_orchestration", 
-                "agent_management",
-                "priority_assessment",
-                "resource_allocation"
-            ],
+            last_active=time.time(),
+            capabilities=_BOSS_CAPS,
             performance_score=1.0
         )
         
-        self.boss_agent = AutonomousAgent(boss_info)
-        self.agents[0] = self.boss_agent
+        boss_agent = AutonomousAgent(boss_info, self._reindex_agent)
+        self.agents[0] = boss_agent
+        self._by_role[AgentRole.BOSS].add(0)
+        bisect.insort(self._sorted_ids, 0)
+        self._reindex_agent(boss_agent)
         
         logger.info("👑 Boss Agent (Agent 0) created and ready")
         
     async def get_or_create_agent(self, agent_name: str) -> AutonomousAgent:
         """Get existing agent or create new subordinate agent"""
         # Check if agent already exists by name
-        for agent in self.agents.values():
-            if agent.info.agent_name == agent_name and agent.info.role == AgentRole.SUBORDINATE:
-                return agent
+        agent_id = self._name_to_id.get(agent_name)
+        if agent_id is not None:
+            return self.agents[agent_id]
+            
+        # Auto-generated agents are only named lazily as "Agent <id>"
+        agent = self._get_auto_named_agent(agent_name)
+        if agent is not None:
+            return agent
                 
         # Create new subordinate agent
         return await self._create_subordinate_agent(agent_name)
         
-    async def _create_subordinate_agent(self, agent_name: str) -> AutonomousAgent:
+    def _get_auto_named_agent(self, agent_name: str) -> Optional[AutonomousAgent]:
+        """Resolve an "Agent <id>" name to an auto-generated subordinate"""
+        prefix, _, number = agent_name.partition(" ")
+        if prefix != "Agent" or not number.isdigit():
+            return None
+        agent = self.agents.get(int(number))
+        if agent is None or agent.info.agent_name is not None or agent.info.role != AgentRole.SUBORDINATE:
+            return None
+        return agent
+        
+    async def _create_subordinate_agent(self, agent_name: Optional[str] = None) -> AutonomousAgent:
         """Create a new subordinate agent with proper numbering"""
-        agent_id = self.next_agent_id
-        self.next_agent_id += 1
+        async with self._id_lock:
+            agent_id = self.next_agent_id
+            self.next_agent_id += 1
         
         # Determine capabilities based on agent name/type
-        capabilities = self._determine_agent_capabilities(agent_name)
+        capabilities = self._determine_agent_capabilities(agent_name) if agent_name else _GENERAL_CAPS
         
         agent_info = AgentInfo(
             agent_id=agent_id,
             agent_name=agent_name,
             role=AgentRole.SUBORDINATE,
-            status="idle",
+            status=AgentStatus.IDLE,
             current_tasks=[],
             completed_tasks=0,
             created_at=datetime.now(),
-            last_active=datetime.now(),
+            last_active=time.time(),
             capabilities=capabilities,
             performance_score=0.8  # Default starting score
         )
         
-        agent = AutonomousAgent(agent_info)
+        agent = AutonomousAgent(agent_info, self._reindex_agent)
         self.agents[agent_id] = agent
+        self._by_role[AgentRole.SUBORDINATE].add(agent_id)
+        self._subordinate_count += 1
+        if agent_name is not None:
+            self._name_to_id.setdefault(agent_name, agent_id)
+        bisect.insort(self._sorted_ids, agent_id)  # Ids are monotonic, so this appends
+        self._reindex_agent(agent)
         
-        logger.info(f"🤖 Created Agent {agent_id} ({agent_name}) as subordinate to Boss")
+        logger.opt(lazy=True).info(
+            "🤖 Created Agent {} ({}) as subordinate to Boss", lambda: agent_id, lambda: agent.name
+        )
         return agent
         
-    def _determine_agent_capabilities(self, agent_name: str) -> List[str]:
-        """Determine agent capabilities based on name/type"""
-        # Simple capability assignment - in production this would be more sophisticated
-        base_capabilities = ["task_execution", "problem_solving", "data_processing"]
-        
-        if "trading" in agent_name.lower():
-            return base_capabilities + ["market_analysis", "order_execution", "risk_management"]
-        elif "analysis" in agent_name.lower():
-            return base_capabilities + ["data_analysis", "pattern_recognition", "reporting"]
-        elif "research" in agent_name.lower():
-            return base_capabilities + ["web_research", "information_gathering", "summarization"]
-        elif "communication" in agent_name.lower():
-            return base_capabilities + ["message_processing", "notification_handling", "user_interaction"]
+    def _reindex_agent(self, agent: AutonomousAgent):
+        """Update the status indexes after an agent changes state"""
+        self._hierarchy_version += 1
+        agent_id = agent.info.agent_id
+        
+        for ids in self._by_status.values():
+            ids.discard(agent_id)
+        self._by_status[agent.info.status].add(agent_id)
+        
+        if agent.is_busy:
+            self._busy_agents.add(agent_id)
+            self._available_agents.discard(agent_id)
         else:
-            return base_capabilities + ["general_purpose", "adaptable_execution"]
+            self._busy_agents.discard(agent_id)
+            if agent.info.status <= AgentStatus.ACTIVE:
+                self._available_agents.add(agent_id)
+            else:
+                self._available_agents.discard(agent_id)
+            
+        if (agent.info.role == AgentRole.SUBORDINATE and
+                not agent.is_busy and agent.info.status == AgentStatus.IDLE):
+            self._idle_subordinates.add(agent_id)
+        else:
+            self._idle_subordinates.discard(agent_id)
+            
+    def _remove_agent(self, agent_id: int):
+        """Remove a subordinate agent and drop it from every index"""
+        self._hierarchy_version += 1
+        agent = self.agents.pop(agent_id)
+        agent._on_state_change = None
+        self._sorted_ids.remove(agent_id)
+        self._by_role[agent.info.role].discard(agent_id)
+        for ids in self._by_status.values():
+            ids.discard(agent_id)
+        self._busy_agents.discard(agent_id)
+        self._available_agents.discard(agent_id)
+        self._idle_subordinates.discard(agent_id)
+        if agent.info.role == AgentRole.SUBORDINATE:
+            self._subordinate_count -= 1
+        if agent.info.agent_name is not None and self._name_to_id.get(agent.info.agent_name) == agent_id:
+            del self._name_to_id[agent.info.agent_name]
+            
+    def _determine_agent_capabilities(self, agent_name: str) -> Tuple[str, ...]:
+        """Determine agent capabilities based on name/type"""
+        return _capabilities_for_name(agent_name)
             
     def get_available_agents(self) -> List[Dict[str, Any]]:
         """Get list of available agents for task assignment"""
-        available = []
-        for agent in self.agents.values():
-            status = agent.get_status()
-            if status["status"] in ["idle", "active"]:  # Available for new tasks
-                available.append(status)
-        return available
+        return [self.agents[agent_id].get_status() for agent_id in sorted(self._available_agents)]
         
     def get_active_agents(self) -> List[Dict[str, Any]]:
         """Get list of currently active agents"""
-        active = []
-        for agent in self.agents.values():
-            if agent.is_busy or agent.info.status == "active":
-                active.append(agent.get_status())
-        return active
+        active_ids = self._busy_agents | self._by_status[AgentStatus.ACTIVE]
+        return [self.agents[agent_id].get_status() for agent_id in sorted(active_ids)]
+        
+    def _snapshot_all(self):
+        """Build every agent's status in one pass: (boss, subordinates, all by id)"""
+        agents = self.agents
+        all_by_id = {agent_id: agents[agent_id].get_status() for agent_id in self._sorted_ids}
+        # The boss is always Agent 0, which sorts first
+        snapshots = list(all_by_id.values())
+        return snapshots[0], snapshots[1:], all_by_id
         
     def get_all_statuses(self) -> Dict[str, Any]:
         """Get status of all agents"""
+        boss_snapshot, _, all_by_id = self._snapshot_all()
         return {
             "total_agents": len(self.agents),
-            "boss_status": self.boss_agent.get_status() if self.boss_agent else None,
-            "subordinate_count": len(self.agents) - 1,  # Exclude boss
-            "agents": {
-                agent_id: agent.get_status() 
-                for agent_id, agent in self.agents.items()
-            }
+            "boss_status": boss_snapshot,
+            "subordinate_count": self._subordinate_count,
+            "agents": all_by_id
         }
         
     def get_agent_by_id(self, agent_id: int) -> Optional[AutonomousAgent]:
@@ -253,29 +414,29 @@ class AgentHierarchy:
         
     def get_recommended_agents(self) -> List[str]:
         """Get recommended agents for next iteration"""
+        if self._rec_cache and self._rec_cache[0] == self._hierarchy_version:
+            return self._rec_cache[1][:]
+            
         recommendations = []
         
         # Always include boss
         recommendations.append("Boss Agent")
         
         # Recommend idle agents with good performance
-        for agent in self.agents.values():
-            if (agent.info.role == AgentRole.SUBORDINATE and 
-                agent.info.status == "idle" and 
-                agent.info.performance_score > 0.7):
-                recommendations.append(agent.info.agent_name)
+        for agent_id in sorted(self._idle_subordinates):
+            agent = self.agents[agent_id]
+            if agent.info.performance_score > 0.7:
+                recommendations.append(agent.name)
                 
-        return recommendations
+        self._rec_cache = (self._hierarchy_version, recommendations)
+        return recommendations[:]
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert hierarchy to dictionary representation"""
+        boss_snapshot, subordinate_snapshots, _ = self._snapshot_all()
         return {
-            "boss_agent": self.boss_agent.get_status() if self.boss_agent else None,
-            "subordinate_agents": [
-                agent.get_status() 
-                for agent in self.agents.values() 
-                if agent.info.role == AgentRole.SUBORDINATE
-            ],
+            "boss_agent": boss_snapshot,
+            "subordinate_agents": subordinate_snapshots,
             "total_agents": len(self.agents),
             "next_agent_id": self.next_agent_id,
             "hierarchy_established": datetime.now().isoformat()
@@ -283,25 +444,27 @@ class AgentHierarchy:
         
     async def scale_agents(self, target_count: int):
         """Scale number of subordinate agents"""
-        current_subordinates = len([a for a in self.agents.values() if a.info.role == AgentRole.SUBORDINATE])
+        current_subordinates = self._subordinate_count
         
         if target_count > current_subordinates:
             # Create new agents
-            for i in range(target_count - current_subordinates):
-                await self._create_subordinate_agent(f"Agent {self.next_agent_id}")
+            await asyncio.gather(*[
+                self._create_subordinate_agent()
+                for _ in range(target_count - current_subordinates)
+            ])
                 
         elif target_count < current_subordinates:
-            # Remove idle agents (but keep boss)
-            agents_to_remove = []
-            for agent_id, agent in self.agents.items():
-                if (agent.info.role == AgentRole.SUBORDINATE and 
-                    not agent.is_busy and 
-                    len(agents_to_remove) < (current_subordinates - target_count)):
-                    agents_to_remove.append(agent_id)
-                    
-            for agent_id in agents_to_remove:
-                del self.agents[agent_id]
-                logger.info(f"🗑️ Removed Agent {agent_id}")
+            # Remove idle agents first, then non-busy ones left in error (but keep boss)
+            to_remove = current_subordinates - target_count
+            errored = (
+                self._by_status[AgentStatus.ERROR] & self._by_role[AgentRole.SUBORDINATE]
+            ) - self._busy_agents
+            for pool in (self._idle_subordinates, errored):
+                while to_remove and pool:
+                    agent_id = pool.pop()
+                    self._remove_agent(agent_id)
+                    to_remove -= 1
+                    logger.info("🗑️ Removed Agent {}", agent_id)
                 
         logger.info(f"📊 Scaled to {target_count} subordinate agents (+ Boss)")
         
@@ -309,11 +472,11 @@ class AgentHierarchy:
         """Get agent info for UI display with human-readable numbering"""
         display_info = []
         
-        # Sort agents by ID to ensure proper display order
-        sorted_agents = sorted(self.agents.items())
-        
-        for agent_id, agent in sorted_agents:
-            status = agent.get_status()
+        # Snapshot ids are in sorted order for proper display order
+        _, _, all_by_id = self._snapshot_all()
+        agents = self.agents
+        for agent_id, status in all_by_id.items():
+            agent = agents[agent_id]
             
             # Human-readable display name
             if agent.info.role == AgentRole.BOSS:
@@ -324,7 +487,7 @@ class AgentHierarchy:
             display_info.append({
                 "display_name": display_name,
                 "internal_id": agent_id,
-                "agent_name": agent.info.agent_name,
+                "agent_name": status["agent_name"],
                 "role": agent.info.role.value,
                 "status": status["status"],
                 "completed_tasks": status["completed_tasks"],
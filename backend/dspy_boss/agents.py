@@ -4,12 +4,19 @@ Agent management system for DSPY Boss
 """
 
 import asyncio
-import threading
-from typing import Dict, List, Optional, Any, Callable
+import heapq
+import hashlib
+import json
+import os
+import string
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Deque, Dict, List, Optional, Any, Callable, Set, Tuple
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 import uuid
+import weakref
 
 import dspy
 from dspy import Signature, InputField, OutputField
@@ -19,6 +26,29 @@ from .task_manager import TaskManager
 from .mcp import MCPManager
 
 
+# Size of the default executor that blocking DSPY calls run on via asyncio.to_thread
+_DSPY_POOL_SIZE = int(os.getenv("DSPY_THREAD_POOL_SIZE", "32"))
+_executor_loops: "weakref.WeakSet[asyncio.AbstractEventLoop]" = weakref.WeakSet()
+
+
+def _install_default_executor():
+    """Give the running loop a default executor sized for LLM-bound work, once per loop"""
+    loop = asyncio.get_running_loop()
+    if loop not in _executor_loops:
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=_DSPY_POOL_SIZE, thread_name_prefix="dspy")
+        )
+        _executor_loops.add(loop)
+
+
+def _required_capabilities(task: TaskDefinition) -> frozenset:
+    """Capabilities a task requires, frozen once and cached on the task"""
+    required = getattr(task, '_req_caps_frozen', None)
+    if required is None:
+        required = frozenset(getattr(task, 'required_capabilities', ()))
+        task._req_caps_frozen = required
+    return required
+
 class AgentSignature(Signature):
     """Base DSPY signature for agents"""
     task_description = InputField(desc="Description of the task to be performed")
@@ -44,22 +74,33 @@ class BaseAgent:
         self.config = config
         self.task_manager = task_manager
         self.mcp_manager = mcp_manager
+        self._cap_set = frozenset(config.capabilities)
+        self._type_value = config.type.value
         
         self.is_active = False
-        self.current_tasks: List[str] = []
-        self.completed_tasks: List[str] = []
-        self.failed_tasks: List[str] = []
+        self.current_tasks: Set[str] = set()
+        self.completed_tasks: Deque[str] = deque(maxlen=1000)  # Most recent only
+        self.failed_tasks: Deque[str] = deque(maxlen=1000)
+        
+        self._task: Optional[asyncio.Task] = None
+        self.stop_event = asyncio.Event()
         
-        self.thread: Optional[threading.Thread] = None
-        self.stop_event = threading.Event()
+        # Wake-up queue of assigned task ids (None asks the run loop to stop)
+        self._task_queue: asyncio.Queue = asyncio.Queue()
         
         # Performance metrics
         self.total_tasks_processed = 0
+        self._success_count = 0
         self.success_rate = 0.0
         self.average_task_duration = 0.0
-        self.last_active = datetime.utcnow()
+        self.last_active = time.monotonic()
+        self._last_active_iso: Optional[str] = None  # Formatted lazily by get_status
         
-        logger.info(f"Initialized {self.config.type.value} agent: {self.config.name}")
+        # Cached get_status() result, rebuilt only after a state change
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_dirty = True
+        
+        logger.info(f"Initialized {self._type_value} agent: {self.config.name}")
     
     def can_accept_task(self, task: TaskDefinition) -> bool:
         """Check if agent can accept a new task"""
@@ -70,10 +111,8 @@ class BaseAgent:
             return False
         
         # Check if agent has required capabilities
-        if hasattr(task, 'required_capabilities'):
-            for capability in task.required_capabilities:
-                if capability not in self.config.capabilities:
-                    return False
+        if not _required_capabilities(task).issubset(self._cap_set):
+            return False
         
         return True
     
@@ -82,9 +121,10 @@ class BaseAgent:
         if not self.can_accept_task(task):
             return False
         
-        self.current_tasks.append(task.id)
+        self.current_tasks.add(task.id)
         task.assigned_agent_id = self.config.id
-        self.last_active = datetime.utcnow()
+        self._touch()
+        self._task_queue.put_nowait(task.id)
         
         logger.info(f"Assigned task {task.name} to agent {self.config.name}")
         return True
@@ -94,67 +134,55 @@ class BaseAgent:
         raise NotImplementedError("Subclasses must implement execute_task")
     
     def start(self):
-        """Start the agent in a separate thread"""
+        """Start the agent as a task on the running event loop"""
         if self.is_active:
             return
         
         self.is_active = True
+        self._status_dirty = True
         self.stop_event.clear()
-        self.thread = threading.Thread(target=self._run_loop, daemon=True)
-        self.thread.start()
+        _install_default_executor()
+        self._task = asyncio.create_task(self._async_run_loop())
         
         logger.info(f"Started agent: {self.config.name}")
     
     def stop(self):
-        """Stop the agent"""
+        """Stop the agent once its current task (if any) finishes"""
         if not self.is_active:
             return
         
         self.is_active = False
+        self._status_dirty = True
         self.stop_event.set()
-        
-        if self.thread:
-            self.thread.join(timeout=5)
+        self._task_queue.put_nowait(None)
         
         logger.info(f"Stopped agent: {self.config.name}")
     
-    def _run_loop(self):
-        """Main execution loop for the agent"""
-        asyncio.set_event_loop(asyncio.new_event_loop())
-        loop = asyncio.get_event_loop()
-        
-        try:
-            loop.run_until_complete(self._async_run_loop())
-        except Exception as e:
-            logger.error(f"Error in agent {self.config.name} run loop: {e}")
-        finally:
-            loop.close()
-    
     async def _async_run_loop(self):
-        """Async run loop"""
-        while self.is_active and not self.stop_event.is_set():
+        """Async run loop - sleeps until a task is assigned"""
+        while not self.stop_event.is_set():
+            task_id = await self._task_queue.get()
+            if self.stop_event.is_set():
+                break
+            if task_id is None:
+                continue  # Wake-up left over from an earlier stop()
+            
             try:
-                # Check for assigned tasks
-                if self.current_tasks:
-                    task_id = self.current_tasks[0]  # Process first task
-                    task = self.task_manager.get_task_status(task_id)
-                    
-                    if task and task.status == TaskStatus.PENDING:
-                        await self._process_task(task)
+                task = self.task_manager.get_task_status(task_id)
                 
-                await asyncio.sleep(1)  # Small delay to prevent busy waiting
+                if task and task.status == TaskStatus.PENDING:
+                    await self._process_task(task)
                 
             except Exception as e:
                 logger.error(f"Error in agent {self.config.name} async loop: {e}")
-                await asyncio.sleep(5)  # Longer delay on error
     
     async def _process_task(self, task: TaskDefinition):
         """Process a single task"""
-        start_time = datetime.utcnow()
+        t0 = time.perf_counter()
         
         try:
             task.status = TaskStatus.RUNNING
-            task.started_at = start_time
+            task.started_at = datetime.utcnow()
             
             # Execute the task
             result = await self.execute_task(task)
@@ -165,7 +193,7 @@ class BaseAgent:
             task.result = result
             
             # Update metrics
-            duration = (task.completed_at - start_time).total_seconds()
+            duration = time.perf_counter() - t0
             self._update_metrics(True, duration)
             
             # Move task to completed
@@ -181,7 +209,7 @@ class BaseAgent:
             task.error_message = str(e)
             
             # Update metrics
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = time.perf_counter() - t0
             self._update_metrics(False, duration)
             
             # Move task to failed
@@ -193,21 +221,38 @@ class BaseAgent:
     def _update_metrics(self, success: bool, duration: float):
         """Update performance metrics"""
         self.total_tasks_processed += 1
+        self._status_dirty = True
         
         # Update success rate
-        successful_tasks = len(self.completed_tasks)
-        self.success_rate = (successful_tasks / self.total_tasks_processed) * 100
-        
-        # Update average duration
-        total_duration = self.average_task_duration * (self.total_tasks_processed - 1) + duration
-        self.average_task_duration = total_duration / self.total_tasks_processed
+        if success:
+            self._success_count += 1
+        self.success_rate = (self._success_count / self.total_tasks_processed) * 100
+        
+        # Update average duration (incremental mean)
+        self.average_task_duration += (duration - self.average_task_duration) / self.total_tasks_processed
+    
+    def _touch(self):
+        """Record activity now"""
+        self.last_active = time.monotonic()
+        self._last_active_iso = None
+        self._status_dirty = True
+    
+    def _last_active_isoformat(self) -> str:
+        """ISO wall-clock time of the monotonic last_active stamp, formatted once per touch"""
+        if self._last_active_iso is None:
+            wall = datetime.utcnow() - timedelta(seconds=time.monotonic() - self.last_active)
+            self._last_active_iso = wall.isoformat()
+        return self._last_active_iso
     
     def get_status(self) -> Dict[str, Any]:
         """Get agent status"""
-        return {
+        if not self._status_dirty and self._status_cache is not None:
+            return self._status_cache.copy()
+        
+        self._status_cache = {
             "id": self.config.id,
             "name": self.config.name,
-            "type": self.config.type.value,
+            "type": self._type_value,
             "is_active": self.is_active,
             "is_available": self.config.is_available,
             "current_tasks": len(self.current_tasks),
@@ -215,20 +260,28 @@ class BaseAgent:
             "total_tasks_processed": self.total_tasks_processed,
             "success_rate": round(self.success_rate, 2),
             "average_task_duration": round(self.average_task_duration, 2),
-            "last_active": self.last_active.isoformat(),
+            "last_active": self._last_active_isoformat(),
             "capabilities": self.config.capabilities
         }
+        self._status_dirty = False
+        return self._status_cache.copy()
 
 
 class AgenticAgent(BaseAgent):
     """Autonomous agent using DSPY"""
     
+    # Results of previous DSPY runs keyed by task/context fingerprint, shared by all agents
+    _plan_cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _plan_cache_size = 512
+    _plan_cache_ttl = 7 * 86400  # seconds
+    
     def __init__(self, config: AgentConfig, task_manager: TaskManager, mcp_manager: MCPManager, 
                  prompt_signatures: Dict[str, PromptSignature]):
         super().__init__(config, task_manager, mcp_manager)
         
         self.prompt_signatures = prompt_signatures
         self.dspy_module = None
+        self._needs_mcp_context = True  # Whether the prompt uses the connected MCP server list
         
         # Initialize DSPY module
         self._initialize_dspy_module()
@@ -240,6 +293,12 @@ class AgenticAgent(BaseAgent):
             signature_name = self.config.prompt_signature
             if signature_name and signature_name in self.prompt_signatures:
                 prompt_sig = self.prompt_signatures[signature_name]
+                self._needs_mcp_context = (
+                    prompt_sig.is_react_agent
+                    or bool(prompt_sig.react_tools)
+                    or "mcp" in prompt_sig.signature.lower()
+                    or any("mcp" in field.lower() for field in prompt_sig.input_fields)
+                )
                 
                 if prompt_sig.is_react_agent:
                     self.dspy_module = dspy.ReAct(ReactAgentSignature)
@@ -265,35 +324,74 @@ class AgenticAgent(BaseAgent):
             context = {
                 "task_id": task.id,
                 "parameters": task.parameters,
-                "capabilities": self.config.capabilities,
-                "available_mcp_servers": self.mcp_manager.get_connected_servers()
+                "capabilities": self.config.capabilities
             }
+            if self._needs_mcp_context:
+                context["available_mcp_servers"] = self.mcp_manager.get_connected_servers()
+            
+            # Reuse a recent result for the same task and context
+            fingerprint = self._plan_fingerprint(task, context)
+            cached = self._get_cached_plan(fingerprint)
+            if cached is not None:
+                return cached
+            
+            # Serialize the context once for whichever module runs
+            context_str = json.dumps(context, default=str, separators=(",", ":"))
             
             # Execute DSPY module
             if isinstance(self.dspy_module, dspy.ReAct):
-                result = await self._execute_react_agent(task, context)
+                result = await self._execute_react_agent(task, context_str)
             else:
-                result = await self._execute_chain_of_thought(task, context)
+                result = await self._execute_chain_of_thought(task, context_str)
             
+            self._store_cached_plan(fingerprint, result)
             return result
             
         except Exception as e:
             logger.error(f"Error executing task with DSPY: {e}")
             raise
     
-    async def _execute_chain_of_thought(self, task: TaskDefinition, context: Dict[str, Any]) -> Any:
+    def _plan_fingerprint(self, task: TaskDefinition, context: Dict[str, Any]) -> str:
+        """SHA-256 over the task description, module type, model and stable context"""
+        stable_context = {k: v for k, v in context.items() if k != "task_id"}
+        payload = "|".join((
+            type(self.dspy_module).__name__,
+            self.config.model_name or "",
+            task.description,
+            json.dumps(stable_context, sort_keys=True, default=str)
+        ))
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _get_cached_plan(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result if present and not expired"""
+        entry = self._plan_cache.get(fingerprint)
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self._plan_cache_ttl:
+            del self._plan_cache[fingerprint]
+            return None
+        
+        self._plan_cache.move_to_end(fingerprint)
+        return dict(result)
+    
+    def _store_cached_plan(self, fingerprint: str, result: Dict[str, Any]):
+        """Store a result, evicting the least recently used entry when full"""
+        self._plan_cache[fingerprint] = (time.monotonic(), dict(result))
+        self._plan_cache.move_to_end(fingerprint)
+        if len(self._plan_cache) > self._plan_cache_size:
+            self._plan_cache.popitem(last=False)
+    
+    async def _execute_chain_of_thought(self, task: TaskDefinition, context_str: str) -> Any:
         """Execute using ChainOfThought"""
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.dspy_module(
-                        task_description=task.description,
-                        context=str(context)
-                    )
-                )
+            # Run in the default executor to avoid blocking
+            result = await asyncio.to_thread(
+                self.dspy_module,
+                task_description=task.description,
+                context=context_str
+            )
             
             return {
                 "result": result.result,
@@ -305,19 +403,15 @@ class AgenticAgent(BaseAgent):
             logger.error(f"Error in ChainOfThought execution: {e}")
             raise
     
-    async def _execute_react_agent(self, task: TaskDefinition, context: Dict[str, Any]) -> Any:
+    async def _execute_react_agent(self, task: TaskDefinition, context_str: str) -> Any:
         """Execute using ReAct agent"""
         try:
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                result = await loop.run_in_executor(
-                    executor,
-                    lambda: self.dspy_module(
-                        question=task.description,
-                        context=str(context)
-                    )
-                )
+            # Run in the default executor to avoid blocking
+            result = await asyncio.to_thread(
+                self.dspy_module,
+                question=task.description,
+                context=context_str
+            )
             
             return {
                 "answer": result.answer,
@@ -332,6 +426,27 @@ class AgenticAgent(BaseAgent):
             raise
 
 
+# Message sent to human agents, built once at import
+_TASK_MESSAGE_TEMPLATE = string.Template("""🤖 **Task Assignment from DSPY Boss**
+
+**Task:** $name
+**Description:** $description
+**Priority:** $priority
+**Task ID:** $task_id
+
+**Parameters:**
+$parameters
+
+**Required Capabilities:** $capabilities
+
+Please complete this task and respond with your results. You can reply with:
+- ✅ Success: [your results]
+- ❌ Failed: [error description]
+- ⏸️ Need more info: [what you need]
+
+**Timeout:** $timeout seconds (if specified)""")
+
+
 class HumanAgent(BaseAgent):
     """Human agent that communicates via MCP servers"""
     
@@ -339,6 +454,7 @@ class HumanAgent(BaseAgent):
         super().__init__(config, task_manager, mcp_manager)
         
         self.pending_human_tasks: Dict[str, TaskDefinition] = {}
+        self._pending_futures: Dict[str, asyncio.Future] = {}  # Resolved by receive_human_response
         self.response_timeout = 3600  # 1 hour default timeout
     
     async def execute_task(self, task: TaskDefinition) -> Any:
@@ -367,113 +483,86 @@ class HumanAgent(BaseAgent):
         # Prepare message
         message = self._format_task_message(task)
         
-        if contact_method == "slack":
-            await self._send_slack_message(message, contact_details)
-        elif contact_method == "close_crm":
-            await self._send_crm_message(message, contact_details)
-        else:
+        sender = self._SENDERS.get(contact_method)
+        if sender is None:
             raise ValueError(f"Unsupported contact method: {contact_method}")
+        await sender(self, message, contact_details)
         
         # Store task as pending
         self.pending_human_tasks[task.id] = task
+        self._pending_futures[task.id] = asyncio.get_running_loop().create_future()
         logger.info(f"Sent task {task.name} to human agent {self.config.name} via {contact_method}")
     
     def _format_task_message(self, task: TaskDefinition) -> str:
         """Format task as message for human"""
-        message = f"""
-🤖 **Task Assignment from DSPY Boss**
-
-**Task:** {task.name}
-**Description:** {task.description}
-**Priority:** {task.priority.name}
-**Task ID:** {task.id}
-
-**Parameters:**
-{self._format_parameters(task.parameters)}
-
-**Required Capabilities:** {', '.join(getattr(task, 'required_capabilities', []))}
-
-Please complete this task and respond with your results. You can reply with:
-- ✅ Success: [your results]
-- ❌ Failed: [error description]
-- ⏸️ Need more info: [what you need]
-
-**Timeout:** {task.timeout} seconds (if specified)
-        """.strip()
-        
-        return message
+        return _TASK_MESSAGE_TEMPLATE.substitute(
+            name=task.name,
+            description=task.description,
+            priority=task.priority.name,
+            task_id=task.id,
+            parameters=self._format_parameters(task.parameters),
+            capabilities=', '.join(getattr(task, 'required_capabilities', [])),
+            timeout=task.timeout
+        )
     
     def _format_parameters(self, parameters: Dict[str, Any]) -> str:
         """Format task parameters for display"""
         if not parameters:
             return "None"
         
-        formatted = []
-        for key, value in parameters.items():
-            formatted.append(f"- **{key}:** {value}")
-        
-        return "\n".join(formatted)
+        return "\n".join(f"- **{key}:** {value}" for key, value in parameters.items())
     
-    async def _send_slack_message(self, message: str, contact_details: Dict[str, Any]):
-        """Send message via Slack MCP server"""
-        slack_servers = self.mcp_manager.find_servers_by_capability("messaging")
+    async def _send_via_mcp(self, contact_method: str, endpoint: str, data: Dict[str, Any]):
+        """Send a request to the first MCP server serving the contact method"""
+        capability = self._CAPABILITY_BY_METHOD[contact_method]
+        label = self._LABEL_BY_METHOD[contact_method]
+        servers = self.mcp_manager.find_servers_by_capability(capability)
+        
+        if not servers:
+            raise RuntimeError(f"No {label} MCP server available")
         
-        if not slack_servers:
-            raise RuntimeError("No Slack MCP server available")
+        server_name = servers[0]  # Use first available
         
-        server_name = slack_servers[0]  # Use first available
+        response = await self.mcp_manager.send_request(server_name, "POST", endpoint, data)
         
-        # Prepare Slack message data
-        data = {
+        if not response.success:
+            raise RuntimeError(f"Failed to send {label} message: {response.error}")
+    
+    async def _send_slack_message(self, message: str, contact_details: Dict[str, Any]):
+        """Send message via Slack MCP server"""
+        await self._send_via_mcp("slack", "chat.postMessage", {
             "channel": contact_details.get("channel", "#general"),
             "text": message,
             "username": "DSPY Boss"
-        }
-        
-        response = await self.mcp_manager.send_request(server_name, "POST", "chat.postMessage", data)
-        
-        if not response.success:
-            raise RuntimeError(f"Failed to send Slack message: {response.error}")
+        })
     
     async def _send_crm_message(self, message: str, contact_details: Dict[str, Any]):
         """Send message via Close CRM MCP server"""
-        crm_servers = self.mcp_manager.find_servers_by_capability("crm")
-        
-        if not crm_servers:
-            raise RuntimeError("No CRM MCP server available")
-        
-        server_name = crm_servers[0]  # Use first available
-        
-        # Prepare CRM message data
-        data = {
+        await self._send_via_mcp("close_crm", "messages", {
             "user_id": contact_details.get("user_id"),
             "message": message,
             "subject": f"Task Assignment: {contact_details.get('task_name', 'New Task')}"
-        }
-        
-        response = await self.mcp_manager.send_request(server_name, "POST", "messages", data)
-        
-        if not response.success:
-            raise RuntimeError(f"Failed to send CRM message: {response.error}")
+        })
+    
+    # Contact method -> sender, MCP capability and display label
+    _SENDERS: Dict[str, Callable] = {
+        "slack": _send_slack_message,
+        "close_crm": _send_crm_message,
+    }
+    _CAPABILITY_BY_METHOD: Dict[str, str] = {"slack": "messaging", "close_crm": "crm"}
+    _LABEL_BY_METHOD: Dict[str, str] = {"slack": "Slack", "close_crm": "CRM"}
     
     async def _wait_for_human_response(self, task: TaskDefinition) -> Any:
-        """Wait for human response (simplified - in real implementation would listen for responses)"""
-        # This is a simplified implementation
-        # In a real system, you would set up webhooks or polling to listen for responses
-        
+        """Wait until receive_human_response resolves the task, or time out"""
         timeout = task.timeout or self.response_timeout
-        start_time = datetime.utcnow()
         
-        while (datetime.utcnow() - start_time).total_seconds() < timeout:
-            # Check if response received (this would be implemented with actual MCP response handling)
-            # For now, we'll simulate waiting
-            await asyncio.sleep(30)  # Check every 30 seconds
-            
-            # In real implementation, check for responses from MCP servers
-            # and parse them to determine if task is complete
-            
-        # If we get here, timeout occurred
-        raise TimeoutError(f"Human agent {self.config.name} did not respond within {timeout} seconds")
+        try:
+            return await asyncio.wait_for(self._pending_futures[task.id], timeout=timeout)
+        except asyncio.TimeoutError:
+            self.pending_human_tasks.pop(task.id, None)
+            raise TimeoutError(f"Human agent {self.config.name} did not respond within {timeout} seconds")
+        finally:
+            self._pending_futures.pop(task.id, None)
     
     def receive_human_response(self, task_id: str, response: str, success: bool = True):
         """Receive response from human (called by MCP message handlers)"""
@@ -490,6 +579,14 @@ Please complete this task and respond with your results. You can reply with:
             task.completed_at = datetime.utcnow()
             del self.pending_human_tasks[task_id]
             
+            # Wake the waiting execute_task
+            future = self._pending_futures.get(task_id)
+            if future and not future.done():
+                if success:
+                    future.set_result(response)
+                else:
+                    future.set_exception(RuntimeError(response))
+            
             logger.info(f"Received human response for task {task_id}: {'Success' if success else 'Failed'}")
 
 
@@ -509,6 +606,23 @@ class AgentManager:
         self.agent_spawn_threshold = 8
         self.next_agent_number = 1
         
+        # Agents partitioned into shards so task assignment scans one shard at a time
+        self.num_agent_shards = 16
+        self._agent_shards: List[Dict[str, BaseAgent]] = [{} for _ in range(self.num_agent_shards)]
+        
+        # Agent ids partitioned by agent class (AgenticAgent / HumanAgent)
+        self._agents_by_type: Dict[type, Set[str]] = defaultdict(set)
+        
+        # Capability -> ids of agents that have it, so assignment only scores capable agents
+        self._cap_index: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Min-heap of (last_active, agent_id) for agentic agents, one entry per agent
+        self._idle_heap: List[Tuple[float, str]] = []
+        
+        # Ids of agents whose config reported them available at creation; agents here never
+        # change config.status, so entries are only added in create_agent and dropped on removal
+        self.available: Set[str] = set()
+        
         logger.info("AgentManager initialized")
     
     def load_agents(self, agent_configs: Dict[str, AgentConfig], 
@@ -536,14 +650,26 @@ class AgentManager:
             raise ValueError(f"Unknown agent type: {agent_type}")
         
         self.agents[config.id] = agent
+        self._agent_shards[self._shard_index(config.id)][config.id] = agent
+        self._agents_by_type[type(agent)].add(config.id)
+        for capability in agent._cap_set:
+            self._cap_index[capability].add(config.id)
+        if isinstance(agent, AgenticAgent):
+            heapq.heappush(self._idle_heap, (agent.last_active, config.id))
+        if config.is_available:
+            self.available.add(config.id)
         agent.start()
         
         logger.info(f"Created and started agent: {config.name}")
         return agent
     
+    def _shard_index(self, key: str) -> int:
+        """Shard that an agent id or task id maps to"""
+        return hash(key) % self.num_agent_shards
+    
     def spawn_agentic_agent(self, capabilities: List[str] = None) -> Optional[BaseAgent]:
         """Spawn a new agentic agent when workload is high"""
-        if len([a for a in self.agents.values() if a.config.type == AgentType.AGENTIC]) >= self.max_agentic_agents:
+        if len(self._agents_by_type[AgenticAgent]) >= self.max_agentic_agents:
             logger.warning("Maximum number of agentic agents reached")
             return None
         
@@ -567,74 +693,91 @@ class AgentManager:
     
     def assign_task_to_best_agent(self, task: TaskDefinition) -> Optional[BaseAgent]:
         """Assign task to the most suitable available agent"""
-        suitable_agents = []
-        
-        # Find agents that can handle the task
-        for agent in self.agents.values():
-            if agent.can_accept_task(task):
-                # Calculate suitability score
-                score = self._calculate_agent_suitability(agent, task)
-                suitable_agents.append((agent, score))
-        
-        if not suitable_agents:
+        best_agent = None
+        required = _required_capabilities(task)
+        
+        if required:
+            # Only agents holding every required capability can accept the task,
+            # so intersect the index sets starting from the smallest one
+            index_sets = sorted((self._cap_index.get(c, ()) for c in required), key=len)
+            candidate_ids = set(index_sets[0]).intersection(*index_sets[1:])
+            best_agent = self._best_candidate(
+                (self.agents[agent_id] for agent_id in candidate_ids), task
+            )
+        else:
+            # Find agents that can handle the task, starting from the task's own shard
+            # and only moving on to the next shard if it has no suitable agent
+            first_shard = self._shard_index(task.id)
+            for offset in range(self.num_agent_shards):
+                shard = self._agent_shards[(first_shard + offset) % self.num_agent_shards]
+                best_agent = self._best_candidate(shard.values(), task)
+                if best_agent:
+                    break
+        
+        if not best_agent:
             # Check if we should spawn a new agent
             workload = len(self.state_manager.transition.state_data.pending_tasks)
             if workload >= self.agent_spawn_threshold:
                 new_agent = self.spawn_agentic_agent()
                 if new_agent and new_agent.can_accept_task(task):
-                    suitable_agents.append((new_agent, 1.0))
+                    best_agent = new_agent
         
-        if not suitable_agents:
+        if not best_agent:
             logger.warning(f"No suitable agent found for task: {task.name}")
             return None
         
-        # Sort by suitability score (higher is better)
-        suitable_agents.sort(key=lambda x: x[1], reverse=True)
-        best_agent = suitable_agents[0][0]
-        
         # Assign task
         asyncio.create_task(best_agent.assign_task(task))
         
         logger.info(f"Assigned task {task.name} to agent {best_agent.config.name}")
         return best_agent
     
+    def _best_candidate(self, agents, task: TaskDefinition) -> Optional[BaseAgent]:
+        """Highest-scoring agent among those that can accept the task"""
+        best = max(
+            self._score_agents((agent for agent in agents if agent.can_accept_task(task)), task),
+            key=lambda scored: scored[0],
+            default=None
+        )
+        return best[1] if best else None
+    
     def _calculate_agent_suitability(self, agent: BaseAgent, task: TaskDefinition) -> float:
         """Calculate how suitable an agent is for a task"""
-        score = 0.0
-        
-        # Base score for availability
-        if agent.config.is_available:
-            score += 1.0
-        
-        # Capability matching
-        task_capabilities = getattr(task, 'required_capabilities', [])
-        if task_capabilities:
-            matching_capabilities = set(agent.config.capabilities) & set(task_capabilities)
-            score += len(matching_capabilities) / len(task_capabilities)
-        
-        # Performance history
-        if agent.total_tasks_processed > 0:
-            score += agent.success_rate / 100.0
-        
-        # Current workload (prefer less busy agents)
-        workload_factor = 1.0 - (len(agent.current_tasks) / agent.config.max_concurrent_tasks)
-        score += workload_factor
+        return next(self._score_agents((agent,), task))[0]
+    
+    def _score_agents(self, agents, task: TaskDefinition):
+        """Yield (score, agent) for each agent, with the per-task terms computed once"""
+        task_capabilities = _required_capabilities(task)
+        num_required = len(task_capabilities)
         
         # Human vs Agentic preference
-        if task.requires_human and agent.config.type == AgentType.HUMAN:
-            score += 2.0
-        elif not task.requires_human and agent.config.type == AgentType.AGENTIC:
-            score += 1.0
+        type_bonus = {HumanAgent: 2.0} if task.requires_human else {AgenticAgent: 1.0}
         
-        return score
+        for agent in agents:
+            # Base score for availability
+            score = 1.0 if agent.config.is_available else 0.0
+            
+            # Capability matching
+            if num_required:
+                score += len(agent._cap_set & task_capabilities) / num_required
+            
+            # Performance history
+            if agent.total_tasks_processed > 0:
+                score += agent.success_rate / 100.0
+            
+            # Current workload (prefer less busy agents)
+            score += 1.0 - (len(agent.current_tasks) / agent.config.max_concurrent_tasks)
+            
+            score += type_bonus.get(type(agent), 0.0)
+            yield score, agent
     
     def get_agent_stats(self) -> Dict[str, Any]:
         """Get statistics for all agents"""
         stats = {
             "total_agents": len(self.agents),
             "active_agents": len([a for a in self.agents.values() if a.is_active]),
-            "agentic_agents": len([a for a in self.agents.values() if a.config.type == AgentType.AGENTIC]),
-            "human_agents": len([a for a in self.agents.values() if a.config.type == AgentType.HUMAN]),
+            "agentic_agents": len(self._agents_by_type[AgenticAgent]),
+            "human_agents": len(self._agents_by_type[HumanAgent]),
             "agents": {}
         }
         
@@ -643,30 +786,52 @@ class AgentManager:
         
         return stats
     
-    def stop_all_agents(self):
-        """Stop all agents"""
+    async def stop_all_agents(self, timeout: float = 5.0):
+        """Stop all agents, cancelling any still running after the timeout"""
         logger.info("Stopping all agents...")
         
         for agent in self.agents.values():
             agent.stop()
         
+        run_tasks = [agent._task for agent in self.agents.values() if agent._task]
+        if run_tasks:
+            _, pending = await asyncio.wait(run_tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
         logger.info("All agents stopped")
     
     def remove_idle_agents(self, idle_timeout: int = 1800):
         """Remove agents that have been idle for too long"""
-        current_time = datetime.utcnow()
+        cutoff = time.monotonic() - idle_timeout
         agents_to_remove = []
-        
-        for agent_id, agent in self.agents.items():
-            if (agent.config.type == AgentType.AGENTIC and 
-                len(agent.current_tasks) == 0 and
-                (current_time - agent.last_active).total_seconds() > idle_timeout):
+        still_tracked = []
+        
+        # Only heap entries older than the cutoff can belong to idle agents
+        while self._idle_heap and self._idle_heap[0][0] <= cutoff:
+            _, agent_id = heapq.heappop(self._idle_heap)
+            agent = self.agents.get(agent_id)
+            if agent is None:
+                continue
+            if len(agent.current_tasks) == 0 and agent.last_active <= cutoff:
                 agents_to_remove.append(agent_id)
+            else:
+                # Agent was active since this entry was pushed; track its latest stamp
+                still_tracked.append((agent.last_active, agent_id))
+        
+        for entry in still_tracked:
+            heapq.heappush(self._idle_heap, entry)
         
         for agent_id in agents_to_remove:
             agent = self.agents[agent_id]
             agent.stop()
             del self.agents[agent_id]
+            del self._agent_shards[self._shard_index(agent_id)][agent_id]
+            self._agents_by_type[type(agent)].discard(agent_id)
+            for capability in agent._cap_set:
+                self._cap_index[capability].discard(agent_id)
+            self.available.discard(agent_id)
             logger.info(f"Removed idle agent: {agent.config.name}")
         
         return len(agents_to_remove)
@@ -4,13 +4,19 @@ FastAPI server for DSPY Boss system - Bridges frontend and backend
 
 import asyncio
 import json
+import math
+import operator
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import orjson
+import ormsgpack
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from loguru import logger
 
@@ -22,44 +28,176 @@ from .models import (
 from .state_machine import BossState
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Wire formats a WebSocket client can ask for with /ws?format=...
+WS_FORMATS = ("json", "msgpack")
+
+
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
     
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, max_pending_messages: int = 32):
+        # Each client gets a bounded outbound queue drained by its own relay task
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+        self._relays: Dict[WebSocket, asyncio.Task] = {}
+        self._closing: Set[asyncio.Task] = set()  # Close handshakes for dropped clients, kept referenced
+        self.max_pending_messages = max_pending_messages
+        
+        # Client queues grouped by wire format ("json" text frames or "msgpack" binary frames)
+        self._queues_by_format: Dict[str, Dict[WebSocket, asyncio.Queue]] = {
+            fmt: {} for fmt in WS_FORMATS
+        }
     
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, fmt: str = "json"):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=self.max_pending_messages)
+        self.active_connections[websocket] = queue
+        self._queues_by_format[fmt][websocket] = queue
+        self._relays[websocket] = asyncio.create_task(self._relay(websocket))
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        # O(1) by key; a client already dropped by its relay or broadcast is a no-op
+        if self.active_connections.pop(websocket, None) is None:
+            return
+        for queues in self._queues_by_format.values():
+            queues.pop(websocket, None)
+        self._relays.pop(websocket).cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
+    async def _relay(self, websocket: WebSocket):
+        """Send queued messages to one client"""
+        queue = self.active_connections[websocket]
+        while True:
+            payload = await queue.get()
+            try:
+                if isinstance(payload, bytes):
+                    await websocket.send_bytes(payload)
+                else:
+                    await websocket.send_text(payload)
+            except Exception as e:
+                logger.warning("Failed to send message to WebSocket: {}", e)
+                self.disconnect(websocket)
+                return
+    
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
         if not self.active_connections:
             return
-            
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send message to WebSocket: {e}")
-                disconnected.append(connection)
         
-        # Remove disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+        # Encode once for every client; sent as text frames like send_json
+        self.broadcast_encoded(orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode(), message)
+    
+    def broadcast_encoded(self, payload: str, message: Optional[dict] = None):
+        """Broadcast an already JSON-encoded message to all connected clients
+        
+        msgpack clients get the message packed once; it is decoded from the
+        payload when not given.
+        """
+        payloads = {"json": payload}
+        if self._queues_by_format["msgpack"]:
+            payloads["msgpack"] = ormsgpack.packb(message if message is not None else orjson.loads(payload))
+        
+        # Queue for each client's relay; a client that has fallen too far behind is dropped
+        for fmt, encoded in payloads.items():
+            for websocket, queue in list(self._queues_by_format[fmt].items()):
+                try:
+                    queue.put_nowait(encoded)
+                except asyncio.QueueFull:
+                    logger.warning("WebSocket client is not keeping up, dropping it")
+                    self.disconnect(websocket)
+                    self._close_dropped(websocket)
+    
+    def _close_dropped(self, websocket: WebSocket):
+        """Close a dropped client's socket (1013, try again later) so it knows to reconnect"""
+        task = asyncio.create_task(self._close(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)
+        except Exception as e:
+            logger.debug("Closing dropped WebSocket failed: {}", e)
+
+
+# ISO timestamp of the current second, shared by every response and broadcast in it
+_ts_cache = [-1, ""]
+
+
+def _now_iso() -> str:
+    """Current UTC time as ISO string, formatted at most once per second"""
+    second = int(time.monotonic())
+    if second != _ts_cache[0]:
+        _ts_cache[0] = second
+        _ts_cache[1] = datetime.utcnow().isoformat()
+    return _ts_cache[1]
+
+
+# Fields copied into API listings, extracted in one attrgetter call per item
+AGENT_FIELDS = (
+    "name", "type", "description", "capabilities", "is_available", "max_concurrent_tasks",
+    "model_name", "contact_method", "created_at", "last_active"
+)
+_agent_fields = operator.attrgetter(*AGENT_FIELDS)
+
+TASK_FIELDS = (
+    "id", "title", "description", "priority", "status", "assigned_agent",
+    "capabilities_required", "created_at", "updated_at", "completed_at"
+)
+_task_fields = operator.attrgetter(
+    "id", "title", "description", "priority.value", "status.value", "assigned_agent",
+    "capabilities_required", "created_at", "updated_at", "completed_at"
+)
 
 
 # Global instances
 boss_instance: Optional[DSPYBoss] = None
 connection_manager = ConnectionManager()
 
+# Bumped by API handlers that change state, so the next system update is always sent
+overview_version = 0
+_overview_changed = asyncio.Event()  # Wakes broadcast_updates early after a bump
+
+# system_update has a fixed shape, so it is formatted directly instead of built and encoded
+_SYSTEM_UPDATE_TEMPLATE = (
+    '{"type":"system_update","data":{"boss_state":"%s","active_agents":%d,'
+    '"total_tasks":%d,"health_score":%s,"timestamp":"%s"}}'
+)
+
+
+def _encode_system_update(data: Dict[str, Any], timestamp: str) -> str:
+    """JSON for a system_update message, via the template when every field is safe for it"""
+    state = data["boss_state"]
+    health = data["health_score"]
+    if (
+        isinstance(state, str) and '"' not in state and "\\" not in state
+        and type(data["active_agents"]) is int and type(data["total_tasks"]) is int
+        and isinstance(health, (int, float)) and math.isfinite(health)
+    ):
+        return _SYSTEM_UPDATE_TEMPLATE % (
+            state, data["active_agents"], data["total_tasks"], repr(float(health)), timestamp
+        )
+    return orjson.dumps({"type": "system_update", "data": {**data, "timestamp": timestamp}}).decode()
+
+
+# Broadcast interval: reset to the minimum after a change, doubled while nothing changes
+BROADCAST_MIN_INTERVAL = 2.0
+BROADCAST_MAX_INTERVAL = 10.0
+
+
+def bump_overview_version():
+    """Mark the broadcast system overview as changed"""
+    global overview_version
+    overview_version += 1
+    _overview_changed.set()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -86,9 +224,22 @@ app = FastAPI(
     title="DSPY Boss API",
     description="API server for DSPY Boss system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Registered before CORS so it runs inside it: its 500s get CORS headers, and since the
+# error is answered here (not in Starlette's outermost handler) it is not re-raised and logged twice
+@app.middleware("http")
+async def unhandled_exception_middleware(request: Request, call_next):
+    """Log unexpected endpoint errors once and answer with a 500"""
+    try:
+        return await call_next(request)
+    except Exception as exc:
+        logger.opt(exception=exc).error("Error handling {} {}: {}", request.method, request.url.path, exc)
+        return ORJSONResponse(status_code=500, content={"detail": str(exc)})
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -98,6 +249,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (task/agent/server listings)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Pydantic models for API
 class BossStateUpdate(BaseModel):
@@ -126,7 +280,7 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "boss_running": boss_instance is not None and boss_instance.is_running
     }
 
@@ -137,32 +291,28 @@ async def get_system_overview():
     if not boss_instance:
         raise HTTPException(status_code=503, detail="Boss system not initialized")
     
-    try:
-        # Get current system state
-        current_state = boss_instance.state_manager.current_state
-        metrics = await boss_instance.get_system_metrics()
-        
-        return {
-            "boss_state": current_state.value,
-            "state_data": boss_instance.state_manager.get_state_data(),
-            "metrics": {
-                "timestamp": datetime.utcnow().isoformat(),
-                "uptime_seconds": (datetime.utcnow() - boss_instance.start_time).total_seconds() if boss_instance.start_time else 0,
-                "total_agents": len(boss_instance.agent_manager.agents),
-                "active_agents": len([a for a in boss_instance.agent_manager.agents.values() if a.is_available]),
-                "total_tasks": boss_instance.task_manager.get_queue_size(),
-                "completed_tasks": boss_instance.task_manager.completed_count,
-                "failed_tasks": boss_instance.task_manager.failed_count,
-                "tasks_per_minute": boss_instance.task_manager.get_throughput(),
-                "cpu_usage_percent": metrics.cpu_usage_percent,
-                "memory_usage_mb": metrics.memory_usage_mb,
-                "disk_usage_percent": metrics.disk_usage_percent
-            },
-            "health_score": boss_instance.diagnosis_system.get_health_score()
-        }
-    except Exception as e:
-        logger.error(f"Error getting system overview: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Get current system state
+    current_state = boss_instance.state_manager.current_state
+    metrics = await boss_instance.get_system_metrics()
+    
+    return {
+        "boss_state": current_state.value,
+        "state_data": boss_instance.state_manager.get_state_data(mode="json"),
+        "metrics": {
+            "timestamp": _now_iso(),
+            "uptime_seconds": (datetime.utcnow() - boss_instance.start_time).total_seconds() if boss_instance.start_time else 0,
+            "total_agents": len(boss_instance.agent_manager.agents),
+            "active_agents": len(boss_instance.agent_manager.available),
+            "total_tasks": boss_instance.task_manager.get_queue_size(),
+            "completed_tasks": boss_instance.task_manager.completed_count,
+            "failed_tasks": boss_instance.task_manager.failed_count,
+            "tasks_per_minute": boss_instance.task_manager.get_throughput(),
+            "cpu_usage_percent": metrics.cpu_usage_percent,
+            "memory_usage_mb": metrics.memory_usage_mb,
+            "disk_usage_percent": metrics.disk_usage_percent
+        },
+        "health_score": boss_instance.diagnosis_system.get_health_score()
+    }
 
 
 @app.get("/api/system/boss-state")
@@ -173,8 +323,8 @@ async def get_boss_state():
     
     return {
         "state": boss_instance.state_manager.current_state.value,
-        "data": boss_instance.state_manager.get_state_data(),
-        "timestamp": datetime.utcnow().isoformat()
+        "data": boss_instance.state_manager.get_state_data(mode="json"),
+        "timestamp": _now_iso()
     }
 
 
@@ -195,11 +345,12 @@ async def set_boss_state(state_update: BossStateUpdate):
         )
         
         # Broadcast update
+        bump_overview_version()
         await connection_manager.broadcast({
             "type": "boss_state_change",
             "data": {
                 "state": new_state.value,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _now_iso(),
                 "reason": state_update.reason
             }
         })
@@ -208,9 +359,6 @@ async def set_boss_state(state_update: BossStateUpdate):
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid state: {e}")
-    except Exception as e:
-        logger.error(f"Error setting boss state: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/agents")
@@ -221,20 +369,10 @@ async def get_agents():
     
     agents_data = []
     for agent_id, agent in boss_instance.agent_manager.agents.items():
-        agents_data.append({
-            "id": agent_id,
-            "name": agent.name,
-            "type": agent.type,
-            "description": agent.description,
-            "capabilities": agent.capabilities,
-            "is_available": agent.is_available,
-            "max_concurrent_tasks": agent.max_concurrent_tasks,
-            "current_tasks": len(agent.current_tasks) if hasattr(agent, 'current_tasks') else 0,
-            "model_name": agent.model_name,
-            "contact_method": agent.contact_method,
-            "created_at": agent.created_at,
-            "last_active": agent.last_active
-        })
+        agent_data = dict(zip(AGENT_FIELDS, _agent_fields(agent)))
+        agent_data["id"] = agent_id
+        agent_data["current_tasks"] = len(agent.current_tasks) if hasattr(agent, 'current_tasks') else 0
+        agents_data.append(agent_data)
     
     return agents_data
 
@@ -245,33 +383,29 @@ async def update_agent_model(agent_id: str, model_update: AgentModelUpdate):
     if not boss_instance:
         raise HTTPException(status_code=503, detail="Boss system not initialized")
     
-    try:
-        # Update agent model
-        success = await boss_instance.agent_manager.update_agent_model(
-            agent_id, 
-            model_update.model_name,
-            model_update.provider
-        )
-        
-        if not success:
-            raise HTTPException(status_code=404, detail="Agent not found")
-        
-        # Broadcast update
-        await connection_manager.broadcast({
-            "type": "agent_model_update",
-            "data": {
-                "agent_id": agent_id,
-                "model_name": model_update.model_name,
-                "provider": model_update.provider,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        })
-        
-        return {"success": True}
-        
-    except Exception as e:
-        logger.error(f"Error updating agent model: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Update agent model
+    success = await boss_instance.agent_manager.update_agent_model(
+        agent_id, 
+        model_update.model_name,
+        model_update.provider
+    )
+    
+    if not success:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    
+    # Broadcast update
+    bump_overview_version()
+    await connection_manager.broadcast({
+        "type": "agent_model_update",
+        "data": {
+            "agent_id": agent_id,
+            "model_name": model_update.model_name,
+            "provider": model_update.provider,
+            "timestamp": _now_iso()
+        }
+    })
+    
+    return {"success": True}
 
 
 @app.get("/api/llm-providers")
@@ -280,23 +414,48 @@ async def get_llm_providers():
     if not boss_instance:
         raise HTTPException(status_code=503, detail="Boss system not initialized")
     
-    try:
-        providers = boss_instance.llm_provider_manager.get_available_providers()
-        return {
-            "providers": [
-                {
-                    "name": provider.name,
-                    "type": provider.provider_type,
-                    "models": provider.available_models,
-                    "is_active": provider.is_active,
-                    "config": provider.config
-                }
-                for provider in providers
-            ]
-        }
-    except Exception as e:
-        logger.error(f"Error getting LLM providers: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    providers = boss_instance.llm_provider_manager.get_available_providers()
+    return {
+        "providers": [
+            {
+                "name": provider.name,
+                "type": provider.provider_type,
+                "models": provider.available_models,
+                "is_active": provider.is_active,
+                "config": provider.config
+            }
+            for provider in providers
+        ]
+    }
+
+
+def _read_task_rows(tasks) -> List[tuple]:
+    """Read every task's listed fields before the response starts, so a bad task is a 500"""
+    return [_task_fields(task) for task in tasks]
+
+
+def _stream_json_array(rows, batch_size: int = 100):
+    """Encode task rows as a JSON array in chunks, without building the whole list
+    
+    The 200 is already sent when this runs, so a row that cannot be encoded is logged
+    and left out rather than cutting the body short.
+    """
+    separator = b"["
+    chunk = []
+    for row in rows:
+        try:
+            chunk.append(orjson.dumps(dict(zip(TASK_FIELDS, row)), default=str))
+        except orjson.JSONEncodeError as e:
+            logger.error("Leaving task {} out of the listing: {}", row[0], e)
+            continue
+        if len(chunk) == batch_size:
+            yield separator + b",".join(chunk)
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + b",".join(chunk)
+        separator = b","
+    yield b"]" if separator == b"," else b"[]"
 
 
 @app.get("/api/tasks")
@@ -305,26 +464,8 @@ async def get_tasks():
     if not boss_instance:
         raise HTTPException(status_code=503, detail="Boss system not initialized")
     
-    try:
-        tasks = boss_instance.task_manager.get_all_tasks()
-        return [
-            {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "priority": task.priority.value,
-                "status": task.status.value,
-                "assigned_agent": task.assigned_agent,
-                "capabilities_required": task.capabilities_required,
-                "created_at": task.created_at.isoformat(),
-                "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None
-            }
-            for task in tasks
-        ]
-    except Exception as e:
-        logger.error(f"Error getting tasks: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    rows = _read_task_rows(boss_instance.task_manager.iter_tasks())
+    return StreamingResponse(_stream_json_array(rows), media_type="application/json")
 
 
 @app.post("/api/tasks")
@@ -333,8 +474,8 @@ async def create_task(task_data: TaskCreate):
     if not boss_instance:
         raise HTTPException(status_code=503, detail="Boss system not initialized")
     
+    # Create task
     try:
-        # Create task
         task = TaskDefinition(
             title=task_data.title,
             description=task_data.description,
@@ -342,26 +483,25 @@ async def create_task(task_data: TaskCreate):
             assigned_agent=task_data.assigned_agent,
             capabilities_required=task_data.capabilities_required
         )
-        
-        # Add to task manager
-        task_id = await boss_instance.task_manager.add_task(task)
-        
-        # Broadcast update
-        await connection_manager.broadcast({
-            "type": "task_created",
-            "data": {
-                "task_id": task_id,
-                "title": task_data.title,
-                "priority": task_data.priority,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        })
-        
-        return {"success": True, "task_id": task_id}
-        
-    except Exception as e:
-        logger.error(f"Error creating task: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid task: {e}")
+    
+    # Add to task manager
+    task_id = await boss_instance.task_manager.add_task(task)
+    
+    # Broadcast update
+    bump_overview_version()
+    await connection_manager.broadcast({
+        "type": "task_created",
+        "data": {
+            "task_id": task_id,
+            "title": task_data.title,
+            "priority": task_data.priority,
+            "timestamp": _now_iso()
+        }
+    })
+    
+    return {"success": True, "task_id": task_id}
 
 
 @app.get("/api/mcp-servers")
@@ -370,68 +510,108 @@ async def get_mcp_servers():
     if not boss_instance:
         raise HTTPException(status_code=503, detail="Boss system not initialized")
     
-    try:
-        servers = []
-        for server_id, server in boss_instance.mcp_manager.servers.items():
-            servers.append({
-                "id": server_id,
-                "name": server.config.name,
-                "url": server.config.url,
-                "description": server.config.description,
-                "capabilities": server.config.capabilities,
-                "is_active": server.config.is_active,
-                "is_connected": server.is_connected,
-                "last_connected": server.last_connected.isoformat() if server.last_connected else None,
-                "connection_timeout": server.config.connection_timeout,
-                "retry_attempts": server.config.retry_attempts
-            })
-        
-        return servers
-    except Exception as e:
-        logger.error(f"Error getting MCP servers: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    servers = []
+    for server_id, server in boss_instance.mcp_manager.servers.items():
+        servers.append({
+            "id": server_id,
+            "name": server.config.name,
+            "url": server.config.url,
+            "description": server.config.description,
+            "capabilities": server.config.capabilities,
+            "is_active": server.config.is_active,
+            "is_connected": server.is_connected,
+            "last_connected": server.last_connected,
+            "connection_timeout": server.config.connection_timeout,
+            "retry_attempts": server.config.retry_attempts
+        })
+    
+    return servers
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates"""
-    await connection_manager.connect(websocket)
+    fmt = websocket.query_params.get("format", "json")
+    await connection_manager.connect(websocket, fmt if fmt in WS_FORMATS else "json")
+    bump_overview_version()  # Send the new client the current overview on the next tick
     try:
         while True:
-            # Keep connection alive and handle incoming messages
-            data = await websocket.receive_text()
+            # Keep connection alive and handle incoming messages (text or binary frames)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            data = message.get("bytes") or message.get("text") or ""
+            
+            # Parse JSON commands with orjson; anything else is echoed as received
+            if data[:1] in (b"{", "{"):
+                try:
+                    data = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    pass
+            if isinstance(data, bytes):
+                data = data.decode(errors="replace")
+            
             # Echo back for now (can be extended for client commands)
-            await websocket.send_json({"type": "echo", "data": data})
+            await websocket.send_text(orjson.dumps({"type": "echo", "data": data}).decode())
     except WebSocketDisconnect:
         connection_manager.disconnect(websocket)
 
 
 async def broadcast_updates():
     """Background task to broadcast system updates"""
+    last_sent = None
+    interval = BROADCAST_MIN_INTERVAL
+    
+    # Local aliases for names used on every iteration of this forever loop
+    broadcast_encoded = connection_manager.broadcast_encoded
+    connections = connection_manager.active_connections
+    wait_for_change = _overview_changed.wait
+    wait_for = asyncio.wait_for
+    now_iso = _now_iso
+    
     while True:
         try:
-            if boss_instance and boss_instance.is_running:
+            if boss_instance and boss_instance.is_running and connections:
                 # Get current system state
-                overview = {
-                    "type": "system_update",
-                    "data": {
-                        "boss_state": boss_instance.state_manager.current_state.value,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "active_agents": len([a for a in boss_instance.agent_manager.agents.values() if a.is_available]),
-                        "total_tasks": boss_instance.task_manager.get_queue_size(),
-                        "health_score": boss_instance.diagnosis_system.get_health_score()
-                    }
+                data = {
+                    "boss_state": boss_instance.state_manager.current_state.value,
+                    "active_agents": len(boss_instance.agent_manager.available),
+                    "total_tasks": boss_instance.task_manager.get_queue_size(),
+                    "health_score": boss_instance.diagnosis_system.get_health_score()
                 }
                 
-                await connection_manager.broadcast(overview)
+                # Only encode and send when something changed since the last update
+                current = (overview_version, data)
+                if current != last_sent:
+                    last_sent = current
+                    interval = BROADCAST_MIN_INTERVAL
+                    broadcast_encoded(_encode_system_update(data, now_iso()))
+                else:
+                    interval = min(interval * 2, BROADCAST_MAX_INTERVAL)
             
-            await asyncio.sleep(2)  # Update every 2 seconds
+            # Sleep until the next tick, or until an API change bumps the version
+            _overview_changed.clear()
+            try:
+                await wait_for(wait_for_change(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
             
         except Exception as e:
-            logger.error(f"Error in broadcast updates: {e}")
+            logger.error("Error in broadcast updates: {}", e)
             await asyncio.sleep(5)  # Wait longer on error
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    
+    # uvloop/httptools ship with uvicorn[standard]; a single worker because the
+    # boss instance and WebSocket clients live in this process
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        workers=1
+    )
\ No newline at end of file
@@ -4,25 +4,100 @@ Autonomous DSPY Engine - The core decision-making system driven by DSPY signatur
 """
 
 import asyncio
-import json
-from typing import Dict, List, Optional, Any, Type
+import contextvars
+import functools
+import operator
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, Type
 from datetime import datetime, timedelta
 from loguru import logger
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+import orjson
+
 import dspy
-from dspy import Signature, InputField, OutputField, ChainOfThought, Retrieve
+from dspy import Signature, InputField, OutputField, ChainOfThought, Predict, Retrieve
 
-from .models import SystemState, AgentHierarchy, TaskDefinition, IterationResult
+from .models import SystemState, TaskDefinition, IterationResult
+from .agent_hierarchy import AgentHierarchy
 from .state_holder import StateHolder
 from .llm_providers import LLMProviderManager
 from .mcp import MCPManager
 
 
+# Sorted keys keep prompt text byte-stable between iterations for provider prefix caching
+_DUMPS_OPTIONS = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a prompt input; datetimes, enums and dataclasses are handled natively"""
+    return orjson.dumps(obj, default=str, option=_DUMPS_OPTIONS).decode()
+
+
+# Boss outputs read off a DSPY prediction in one pass
+_DECISION_FIELDS = operator.attrgetter(
+    "decision", "agent_assignments", "priority_tasks", "future_state_forecast", "reasoning"
+)
+
+# "<...Agent...>: <task>" lines; anything after a second colon is dropped
+_ASSIGN_RE = re.compile(r"^(?=[^\n]*Agent)[^\S\n]*([^:\n]*?)[^\S\n]*:[^\S\n]*([^:\n]*?)[^\S\n]*(?::[^\n]*)?$", re.M)
+# Non-empty, non-comment lines with any "1. " style numbering stripped; "1.5 ..." is kept whole
+_TASK_RE = re.compile(r"^[^\S\n]*(?:\d+\.[^\S\n]+)?([^#\s][^\n]*?)[^\S\n]*$", re.M)
+
+
+if sys.version_info >= (3, 11):
+    _TaskGroup = asyncio.TaskGroup
+    _ExceptionGroup = ExceptionGroup
+else:
+    _ExceptionGroup = ()  # The fallback below raises the child's own exception, never a group
+
+    class _TaskGroup:
+        """Python 3.10 stand-in for asyncio.TaskGroup, covering create_task() only.
+
+        Children are cancelled if the body raises or is cancelled, and on the first child failure.
+        Unlike TaskGroup, a failing child does not interrupt a body that is still running.
+        """
+
+        async def __aenter__(self):
+            self._tasks: List[asyncio.Task] = []
+            return self
+
+        def create_task(self, coro) -> asyncio.Task:
+            task = asyncio.ensure_future(coro)
+            self._tasks.append(task)
+            return task
+
+        async def _cancel(self, tasks):
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        async def __aexit__(self, exc_type, exc, tb):
+            if exc_type is not None:
+                await self._cancel(self._tasks)
+                return False
+            pending = self._tasks
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                    for task in done:
+                        if not task.cancelled() and task.exception() is not None:
+                            await self._cancel(pending)
+                            raise task.exception()
+            except asyncio.CancelledError:
+                await self._cancel(pending)
+                raise
+            return False
+
+
 class IterationPhase(str, Enum):
     PRE_PROCESSING = "pre_processing"
     BOSS_DECISION = "boss_decision"
+    FORECASTING = "forecasting"
     EXECUTION = "execution" 
     ERROR_HANDLING = "error_handling"
     NEXT_ITERATION_PREP = "next_iteration_prep"
@@ -30,9 +105,9 @@ class IterationPhase(str, Enum):
 
 class BossDecisionSignature(Signature):
     """DSPY Signature for autonomous boss decision making"""
-    current_state = InputField(desc="Current system state with all available context")
     previous_states = InputField(desc="Historical states (last 100 iterations)")
     available_agents = InputField(desc="List of available subordinate agents")
+    current_state = InputField(desc="Current system state with all available context")
     mcp_data = InputField(desc="Data retrieved from MCP servers")
     
     decision = OutputField(desc="The autonomous decision to make")
@@ -44,9 +119,9 @@ class BossDecisionSignature(Signature):
 
 class PreProcessingSignature(Signature):
     """Pre-processing signature for iteration preparation"""
-    raw_system_data = InputField(desc="Raw system data from sensors and MCP servers")
-    previous_iteration_results = InputField(desc="Results from the previous iteration")
     historical_patterns = InputField(desc="Patterns identified from historical states")
+    previous_iteration_results = InputField(desc="Results from the previous iteration")
+    raw_system_data = InputField(desc="Raw system data from sensors and MCP servers")
     
     processed_context = OutputField(desc="Processed context ready for boss decision")
     priority_insights = OutputField(desc="Key insights that should influence decisions")
@@ -55,16 +130,47 @@ class PreProcessingSignature(Signature):
 
 class ForecastingSignature(Signature):
     """Future state forecasting signature"""
+    historical_outcomes = InputField(desc="Historical outcomes of similar actions")
     current_state = InputField(desc="Current system state")
     planned_actions = InputField(desc="Actions planned for execution")
-    historical_outcomes = InputField(desc="Historical outcomes of similar actions")
     
     future_states = OutputField(desc="Forecasted future states (next 5-10 iterations)")
     potential_risks = OutputField(desc="Potential risks and mitigation strategies")
     success_probabilities = OutputField(desc="Probability estimates for different outcomes")
 
 
-@dataclass
+class CombinedIterationSignature(Signature):
+    """Pre-processing, boss decision and forecast for one iteration in a single completion"""
+    historical_patterns = InputField(desc="Patterns identified from historical states")
+    historical_outcomes = InputField(desc="Historical outcomes of similar actions")
+    previous_states = InputField(desc="Historical states (last 100 iterations)")
+    available_agents = InputField(desc="List of available subordinate agents")
+    previous_iteration_results = InputField(desc="Results from the previous iteration")
+    raw_system_data = InputField(desc="Raw system data from sensors and MCP servers")
+    current_state = InputField(desc="Current system state with all available context")
+    mcp_data = InputField(desc="Data retrieved from MCP servers")
+    
+    processed_context = OutputField(desc="Processed context ready for boss decision")
+    priority_insights = OutputField(desc="Key insights that should influence decisions")
+    environmental_changes = OutputField(desc="Any significant changes in the environment")
+    decision = OutputField(desc="The autonomous decision to make")
+    agent_assignments = OutputField(desc="Which agents to assign to which tasks")
+    priority_tasks = OutputField(desc="Priority ordered list of tasks to execute")
+    future_state_forecast = OutputField(desc="Predicted future states and their planned actions")
+    reasoning = OutputField(desc="Detailed reasoning behind this decision")
+    future_states = OutputField(desc="Forecasted future states (next 5-10 iterations) given the priority tasks")
+    potential_risks = OutputField(desc="Potential risks and mitigation strategies")
+    success_probabilities = OutputField(desc="Probability estimates for different outcomes")
+
+
+# Outputs of CombinedIterationSignature that belong to each optional phase
+_FUSED_PHASE_OUTPUTS = {
+    IterationPhase.PRE_PROCESSING: ("processed_context", "priority_insights", "environmental_changes"),
+    IterationPhase.FORECASTING: ("future_states", "potential_risks", "success_probabilities"),
+}
+
+
+@dataclass(slots=True)
 class IterationContext:
     iteration_id: int
     phase: IterationPhase
@@ -75,6 +181,11 @@ class IterationContext:
     execution_result: Optional[Dict[str, Any]] = None
     error_info: Optional[Dict[str, Any]] = None
     next_prep_result: Optional[Dict[str, Any]] = None
+    mcp_snapshot: Optional[Dict[str, Any]] = None  # One batched MCP fetch per iteration
+    ts_iso: str = field(init=False)  # timestamp.isoformat(), shared by every result dict
+    
+    def __post_init__(self):
+        self.ts_iso = self.timestamp.isoformat()
 
 
 class AutonomousEngine:
@@ -86,25 +197,53 @@ class AutonomousEngine:
         self.mcp_manager = mcp_manager
         
         # DSPY modules - these ARE the intelligence
-        self.pre_processor = ChainOfThought(PreProcessingSignature)
+        self.pre_processor = Predict(PreProcessingSignature)  # Mechanical aggregation, no reasoning trace needed
         self.boss_brain = ChainOfThought(BossDecisionSignature)  # The boss ReAct agent
         self.forecaster = ChainOfThought(ForecastingSignature)
+        self.iteration_brain = ChainOfThought(CombinedIterationSignature)
+        self._fused_brains: Dict[Tuple[IterationPhase, ...], ChainOfThought] = {}  # Keyed by switched-off phases
+        
+        # One fused LLM call per iteration instead of pre-processing -> boss -> forecast
+        self.fuse_llm_calls = True
+        
+        # Optional phases can be switched off at runtime; the boss decision always runs.
+        # With fuse_llm_calls the fused completion drops the outputs of switched-off phases.
+        self.phase_enabled: Dict[IterationPhase, bool] = {
+            IterationPhase.PRE_PROCESSING: True,
+            IterationPhase.FORECASTING: True,
+            IterationPhase.EXECUTION: True,
+        }
+        
+        # Boss LLM calls get their own threads so agent work on the default pool can't delay them
+        self._dspy_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="boss-dspy")
         
         # Agent hierarchy - Boss is Agent 0
         self.agent_hierarchy = AgentHierarchy()
+        self._hier_cache: Tuple[int, Optional[Dict[str, Any]]] = (-1, None)
         
         # Autonomous operation control
         self.is_autonomous = False
         self.iteration_count = 0
         self.current_context: Optional[IterationContext] = None
         
+        # Iteration pacing: at least min_interval apart, backing off exponentially while failing
+        self.min_interval = 0.05
+        self.max_backoff = 30.0
+        self._backoff = self.min_interval
+        
         # Background tasks
         self.autonomous_task: Optional[asyncio.Task] = None
         
+        # Iteration results are persisted by a background writer, off the iteration's critical path
+        self._write_q: "asyncio.Queue[IterationResult]" = asyncio.Queue(maxsize=1000)
+        self._writer_task: Optional[asyncio.Task] = None
+        
     async def start_autonomous_operation(self):
         """Start the autonomous decision-making loop"""
         logger.info("🚀 Starting autonomous DSPY-driven operation")
         self.is_autonomous = True
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
         self.autonomous_task = asyncio.create_task(self._autonomous_loop())
         
     async def stop_autonomous_operation(self):
@@ -118,9 +257,36 @@ class AutonomousEngine:
             except asyncio.CancelledError:
                 pass
                 
+        # Flush queued results before stopping the writer
+        if self._writer_task:
+            await self._write_q.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            
+    async def _writer_loop(self):
+        """Persist queued iteration results in order"""
+        while True:
+            result = await self._write_q.get()
+            try:
+                await self.state_holder.store_iteration_result(result)
+            except Exception as e:
+                logger.error(f"❌ Failed to store iteration {result.iteration_id}: {e}")
+            finally:
+                self._write_q.task_done()
+                
+    async def _run_dspy(self, module, **kwargs):
+        """Run a blocking DSPY module call off the event loop"""
+        call = functools.partial(contextvars.copy_context().run, module, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._dspy_executor, call)
+        
     async def _autonomous_loop(self):
         """Main autonomous iteration loop"""
         while self.is_autonomous:
+            t0 = time.perf_counter()
             try:
                 # Start new iteration
                 self.iteration_count += 1
@@ -128,23 +294,51 @@ class AutonomousEngine:
                     iteration_id=self.iteration_count,
                     phase=IterationPhase.PRE_PROCESSING,
                     timestamp=datetime.now(),
-                    system_state=await self._gather_system_state()
+                    system_state={}
                 )
                 self.current_context = context
                 
-                # === PRE-PROCESSING PHASE ===
-                await self._pre_processing_phase(context)
-                
-                # === BOSS DECISION PHASE ===
-                await self._boss_decision_phase(context)
+                # One batched MCP round trip, shared by every view of the state below
+                context.mcp_snapshot, previous_results = await asyncio.gather(
+                    self.mcp_manager.get_snapshot(),
+                    self._get_previous_iteration_results()
+                )
+                mcp_data = context.mcp_snapshot["data"]
+                context.system_state, raw_data = await asyncio.gather(
+                    self._gather_system_state(context),
+                    self._gather_raw_system_data(context)
+                )
+                previous_states = self.state_holder.get_recent_states_json()  # Last 100 states, pre-serialized
                 
-                # === EXECUTION PHASE ===
-                await self._execution_phase(context)
+                # Child tasks can't outlive the iteration: a failure or cancellation cancels them too
+                enabled = self.phase_enabled
+                async with _TaskGroup() as tg:
+                    if self.fuse_llm_calls:
+                        # === PRE-PROCESSING + BOSS DECISION + FORECAST, ONE LLM CALL ===
+                        await self._fused_decision_phase(context, raw_data, previous_results, previous_states, mcp_data)
+                    else:
+                        # === PRE-PROCESSING PHASE ===
+                        if enabled[IterationPhase.PRE_PROCESSING]:
+                            await self._pre_processing_phase(context, raw_data, previous_results)
+                        
+                        # === BOSS DECISION PHASE ===
+                        planned_actions = await self._boss_decision_phase(context, previous_states, mcp_data)
+                        
+                        # Forecast runs alongside execution; it never gates it
+                        if enabled[IterationPhase.FORECASTING]:
+                            tg.create_task(self._generate_forecast(context, planned_actions))
+                    
+                    # === EXECUTION PHASE ===
+                    if enabled[IterationPhase.EXECUTION]:
+                        await self._execution_phase(context)
                 
                 # Store iteration result
                 await self._store_iteration_result(context)
+                self._backoff = self.min_interval
                 
             except Exception as e:
+                if isinstance(e, _ExceptionGroup) and len(e.exceptions) == 1:
+                    e = e.exceptions[0]  # Report the phase's own error, not the task group wrapper
                 logger.error(f"❌ Error in autonomous iteration {self.iteration_count}: {e}")
                 await self._handle_iteration_error(e)
                 
@@ -152,68 +346,123 @@ class AutonomousEngine:
                 # === NEXT ITERATION PREPARATION ===
                 await self._next_iteration_prep_phase(context)
                 
-                # Brief pause before next iteration
-                await asyncio.sleep(1)  # Adjust timing as needed
+                # Only pause for whatever is left of the current delay
+                await asyncio.sleep(max(0.0, self._backoff - (time.perf_counter() - t0)))
                 
-    async def _pre_processing_phase(self, context: IterationContext):
+    async def _pre_processing_phase(self, context: IterationContext, raw_data: Dict[str, Any],
+                                    previous_results: Dict[str, Any]):
         """Pre-processing phase - prepare context for boss decision"""
         context.phase = IterationPhase.PRE_PROCESSING
         logger.info(f"🔄 Pre-processing iteration {context.iteration_id}")
         
-        # Gather data
-        raw_data = await self._gather_raw_system_data()
-        previous_results = await self._get_previous_iteration_results()
         historical_patterns = self.state_holder.get_historical_patterns()
         
-        # Use DSPY signature for pre-processing
-        result = self.pre_processor(
-            raw_system_data=json.dumps(raw_data, default=str),
-            previous_iteration_results=json.dumps(previous_results, default=str),
-            historical_patterns=json.dumps(historical_patterns, default=str)
+        # Use DSPY signature for pre-processing (blocking LLM call, run off the loop)
+        result = await self._run_dspy(
+            self.pre_processor,
+            raw_system_data=_dumps(raw_data),
+            previous_iteration_results=_dumps(previous_results),
+            historical_patterns=_dumps(historical_patterns)
         )
         
         context.pre_processing_result = {
             "processed_context": result.processed_context,
             "priority_insights": result.priority_insights,
             "environmental_changes": result.environmental_changes,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": context.ts_iso
         }
         
         logger.info(f"✅ Pre-processing complete: {result.priority_insights}")
         
-    async def _boss_decision_phase(self, context: IterationContext):
+    async def _boss_decision_phase(self, context: IterationContext, previous_states: str,
+                                   mcp_data: Dict[str, Any]) -> str:
         """Boss decision phase - autonomous ReAct agent decision making"""
         context.phase = IterationPhase.BOSS_DECISION
         logger.info(f"🧠 Boss making autonomous decision for iteration {context.iteration_id}")
         
         # Prepare input for boss brain
-        current_state = await self._get_comprehensive_state()
-        previous_states = self.state_holder.get_recent_states(100)  # Last 100 states
-        available_agents = self.agent_hierarchy.get_available_agents()
-        mcp_data = await self.mcp_manager.get_latest_data()
+        current_state = self._get_comprehensive_state(context)
+        available_agents = self._stable_agents()
         
         # THE BOSS DECIDES AUTONOMOUSLY using DSPY signature
-        decision = self.boss_brain(
-            current_state=json.dumps(current_state, default=str),
-            previous_states=json.dumps(previous_states, default=str),
-            available_agents=json.dumps(available_agents, default=str),
-            mcp_data=json.dumps(mcp_data, default=str)
+        decision = await self._run_dspy(
+            self.boss_brain,
+            current_state=_dumps(current_state),
+            previous_states=previous_states,
+            available_agents=_dumps(available_agents),
+            mcp_data=_dumps(mcp_data)
         )
         
+        # The raw priority tasks are what the forecast plans against
+        return self._record_boss_decision(context, decision)
+        
+    def _record_boss_decision(self, context: IterationContext, prediction) -> str:
+        """Store the boss outputs of a prediction on the context; returns the raw priority tasks"""
+        decision, assignments, priority_tasks, forecast, reasoning = _DECISION_FIELDS(prediction)
         context.boss_decision = {
-            "decision": decision.decision,
-            "agent_assignments": self._parse_agent_assignments(decision.agent_assignments),
-            "priority_tasks": self._parse_priority_tasks(decision.priority_tasks),
-            "future_forecast": decision.future_state_forecast,
-            "reasoning": decision.reasoning,
-            "timestamp": datetime.now().isoformat()
+            "decision": decision,
+            "agent_assignments": self._parse_agent_assignments(assignments),
+            "priority_tasks": self._parse_priority_tasks(priority_tasks),
+            "future_forecast": forecast,
+            "reasoning": reasoning,
+            "timestamp": context.ts_iso
         }
         
-        logger.info(f"👑 Boss Decision: {decision.decision}")
-        logger.info(f"🎯 Priority Tasks: {decision.priority_tasks}")
+        logger.info(f"👑 Boss Decision: {decision}")
+        logger.info(f"🎯 Priority Tasks: {priority_tasks}")
+        return priority_tasks
+        
+    def _fused_brain(self):
+        """iteration_brain, or a variant without the outputs of switched-off phases"""
+        skipped = tuple(phase for phase in _FUSED_PHASE_OUTPUTS if not self.phase_enabled[phase])
+        if not skipped:
+            return self.iteration_brain
+        brain = self._fused_brains.get(skipped)
+        if brain is None:
+            signature = CombinedIterationSignature
+            for phase in skipped:
+                for name in _FUSED_PHASE_OUTPUTS[phase]:
+                    signature = signature.delete(name)
+            brain = self._fused_brains[skipped] = ChainOfThought(signature)
+        return brain
+        
+    async def _fused_decision_phase(self, context: IterationContext, raw_data: Dict[str, Any],
+                                    previous_results: Dict[str, Any], previous_states: str,
+                                    mcp_data: Dict[str, Any]):
+        """Pre-processing, boss decision and forecast from a single DSPY completion"""
+        context.phase = IterationPhase.BOSS_DECISION
+        logger.info(f"🧠 Boss making autonomous decision for iteration {context.iteration_id}")
         
-        # Generate future state forecast
-        await self._generate_forecast(context, decision)
+        enabled = self.phase_enabled
+        result = await self._run_dspy(
+            self._fused_brain(),
+            raw_system_data=_dumps(raw_data),
+            previous_iteration_results=_dumps(previous_results),
+            historical_patterns=_dumps(self.state_holder.get_historical_patterns()),
+            current_state=_dumps(context.system_state),
+            previous_states=previous_states,
+            available_agents=_dumps(self._stable_agents()),
+            mcp_data=_dumps(mcp_data),
+            historical_outcomes=_dumps(self.state_holder.get_historical_outcomes())
+        )
+        
+        if enabled[IterationPhase.PRE_PROCESSING]:
+            priority_insights = result.priority_insights
+            context.pre_processing_result = {
+                "processed_context": result.processed_context,
+                "priority_insights": priority_insights,
+                "environmental_changes": result.environmental_changes,
+                "timestamp": context.ts_iso
+            }
+            logger.info(f"✅ Pre-processing complete: {priority_insights}")
+        
+        self._record_boss_decision(context, result)
+        if enabled[IterationPhase.FORECASTING]:
+            context.boss_decision["detailed_forecast"] = {
+                "future_states": result.future_states,
+                "potential_risks": result.potential_risks,
+                "success_probabilities": result.success_probabilities
+            }
         
     async def _execution_phase(self, context: IterationContext):
         """Execution phase - carry out boss decisions"""
@@ -224,21 +473,24 @@ class AutonomousEngine:
             logger.error("No boss decision available for execution")
             return
             
-        # Execute agent assignments
+        # Execute agent assignments concurrently - they are independent of each other
+        assignments = context.boss_decision["agent_assignments"]
+        results = await asyncio.gather(
+            *(self._execute_agent_assignment(assignment) for assignment in assignments),
+            return_exceptions=True
+        )
         execution_results = []
-        for assignment in context.boss_decision["agent_assignments"]:
-            try:
-                result = await self._execute_agent_assignment(assignment)
-                execution_results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to execute assignment {assignment}: {e}")
-                execution_results.append({"error": str(e), "assignment": assignment})
+        for assignment, result in zip(assignments, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to execute assignment {assignment}: {result}")
+                result = {"error": str(result), "assignment": assignment}
+            execution_results.append(result)
                 
         context.execution_result = {
             "results": execution_results,
             "tasks_completed": len([r for r in execution_results if "error" not in r]),
             "tasks_failed": len([r for r in execution_results if "error" in r]),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": context.ts_iso
         }
         
         logger.info(f"✅ Execution complete: {context.execution_result['tasks_completed']} successful, {context.execution_result['tasks_failed']} failed")
@@ -259,12 +511,13 @@ class AutonomousEngine:
         context.next_prep_result = {
             "iteration_analysis": iteration_analysis,
             "next_context": next_context,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": context.ts_iso
         }
         
     async def _handle_iteration_error(self, error: Exception):
         """Handle errors in iteration loop"""
         logger.error(f"🚨 Iteration error: {error}")
+        self._backoff = min(self._backoff * 2, self.max_backoff)
         
         if self.current_context:
             self.current_context.error_info = {
@@ -276,24 +529,25 @@ class AutonomousEngine:
         # Store error state for learning
         await self.state_holder.store_error_state(error, self.current_context)
         
-    async def _gather_system_state(self) -> Dict[str, Any]:
+    async def _gather_system_state(self, context: IterationContext) -> Dict[str, Any]:
         """Gather comprehensive system state"""
         return {
             "iteration_count": self.iteration_count,
-            "timestamp": datetime.now().isoformat(),
-            "agent_hierarchy": self.agent_hierarchy.to_dict(),
-            "active_agents": self.agent_hierarchy.get_active_agents(),
+            "timestamp": self._iteration_ts(),
+            "agent_hierarchy": self._hier_snapshot()["to_dict"],
+            "active_agents": self._hier_snapshot()["active"],
             "system_health": await self._get_system_health(),
-            "mcp_status": await self.mcp_manager.get_status(),
+            "mcp_status": context.mcp_snapshot["status"],
             "resource_usage": await self._get_resource_usage()
         }
         
-    async def _generate_forecast(self, context: IterationContext, decision):
+    async def _generate_forecast(self, context: IterationContext, planned_actions: str):
         """Generate future state forecast"""
-        forecast = self.forecaster(
-            current_state=json.dumps(context.system_state, default=str),
-            planned_actions=decision.priority_tasks,
-            historical_outcomes=json.dumps(self.state_holder.get_historical_outcomes(), default=str)
+        forecast = await self._run_dspy(
+            self.forecaster,
+            current_state=_dumps(context.system_state),
+            planned_actions=planned_actions,
+            historical_outcomes=_dumps(self.state_holder.get_historical_outcomes())
         )
         
         context.boss_decision["detailed_forecast"] = {
@@ -305,18 +559,7 @@ class AutonomousEngine:
     def _parse_agent_assignments(self, assignments_str: str) -> List[Dict[str, Any]]:
         """Parse agent assignments from DSPY output"""
         try:
-            # Simple parsing - in production this would be more sophisticated
-            assignments = []
-            for line in assignments_str.split('\n'):
-                if 'Agent' in line and ':' in line:
-                    parts = line.split(':')
-                    agent_part = parts[0].strip()
-                    task_part = parts[1].strip() if len(parts) > 1 else ""
-                    assignments.append({
-                        "agent": agent_part,
-                        "task": task_part
-                    })
-            return assignments
+            return [{"agent": m.group(1), "task": m.group(2)} for m in _ASSIGN_RE.finditer(assignments_str)]
         except Exception as e:
             logger.error(f"Error parsing agent assignments: {e}")
             return []
@@ -324,15 +567,7 @@ class AutonomousEngine:
     def _parse_priority_tasks(self, tasks_str: str) -> List[str]:
         """Parse priority tasks from DSPY output"""
         try:
-            tasks = []
-            for line in tasks_str.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Remove numbering if present
-                    if '. ' in line:
-                        line = line.split('. ', 1)[1]
-                    tasks.append(line)
-            return tasks
+            return [m.group(1) for m in _TASK_RE.finditer(tasks_str)]
         except Exception as e:
             logger.error(f"Error parsing priority tasks: {e}")
             return []
@@ -352,11 +587,11 @@ class AutonomousEngine:
             "agent": agent_name,
             "task": task,
             "result": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": self._iteration_ts()
         }
         
     async def _store_iteration_result(self, context: IterationContext):
-        """Store complete iteration result"""
+        """Queue the complete iteration result for the background writer"""
         iteration_result = IterationResult(
             iteration_id=context.iteration_id,
             timestamp=context.timestamp,
@@ -367,35 +602,60 @@ class AutonomousEngine:
             error_info=context.error_info
         )
         
-        await self.state_holder.store_iteration_result(iteration_result)
-        logger.info(f"💾 Stored iteration {context.iteration_id} results")
+        try:
+            self._write_q.put_nowait(iteration_result)
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ Result queue full, dropping iteration {context.iteration_id} result")
+            return
+        logger.info(f"💾 Queued iteration {context.iteration_id} results")
 
     # Additional helper methods for data gathering and analysis
-    async def _gather_raw_system_data(self) -> Dict[str, Any]:
+    def _hier_snapshot(self) -> Dict[str, Any]:
+        """Hierarchy views, rebuilt only when the hierarchy version moves; treat as read-only"""
+        version = self.agent_hierarchy._hierarchy_version
+        if self._hier_cache[0] != version:
+            hierarchy = self.agent_hierarchy
+            self._hier_cache = (version, {
+                "to_dict": hierarchy.to_dict(),
+                "active": hierarchy.get_active_agents(),
+                "available": hierarchy.get_available_agents(),
+                "statuses": hierarchy.get_all_statuses()
+            })
+        return self._hier_cache[1]
+        
+    def _stable_agents(self) -> List[Any]:
+        """Available agents in agent id order, so the prompt prefix doesn't shift between iterations"""
+        return self._hier_snapshot()["available"]
+        
+    def _iteration_ts(self) -> str:
+        """ISO timestamp of the current iteration, computed once when it started"""
+        return self.current_context.ts_iso if self.current_context else datetime.now().isoformat()
+        
+    async def _gather_raw_system_data(self, context: IterationContext) -> Dict[str, Any]:
         """Gather raw system data"""
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._iteration_ts(),
             "system_metrics": await self._get_system_metrics(),
-            "mcp_data": await self.mcp_manager.get_all_data(),
-            "agent_statuses": self.agent_hierarchy.get_all_statuses()
+            "mcp_data": context.mcp_snapshot["data"],
+            "agent_statuses": self._hier_snapshot()["statuses"]
         }
         
     async def _get_previous_iteration_results(self) -> Dict[str, Any]:
         """Get results from previous iterations"""
         return self.state_holder.get_recent_iteration_results(5)  # Last 5 iterations
         
-    async def _get_comprehensive_state(self) -> Dict[str, Any]:
-        """Get comprehensive current state"""
+    def _get_comprehensive_state(self, context: IterationContext) -> Dict[str, Any]:
+        """Get comprehensive current state from the snapshot taken at iteration start"""
         return {
-            **await self._gather_system_state(),
-            "pre_processing_insights": self.current_context.pre_processing_result if self.current_context else None
+            **context.system_state,
+            "pre_processing_insights": context.pre_processing_result
         }
         
     async def _get_system_health(self) -> Dict[str, Any]:
         """Get system health metrics"""
         return {
             "status": "healthy",  # Implement real health checks
-            "uptime": datetime.now().isoformat(),
+            "uptime": self._iteration_ts(),
             "memory_usage": "normal",
             "cpu_usage": "normal"
         }
@@ -412,7 +672,7 @@ class AutonomousEngine:
         """Get detailed system metrics"""
         return {
             "iterations_completed": self.iteration_count,
-            "autonomous_uptime": datetime.now().isoformat(),
+            "autonomous_uptime": self._iteration_ts(),
             "total_decisions": self.state_holder.get_total_decisions(),
             "success_rate": self.state_holder.get_success_rate()
         }
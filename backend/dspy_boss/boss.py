@@ -4,11 +4,17 @@ Main DSPY Boss class - orchestrates the entire system with autonomous DSPY-drive
 """
 
 import asyncio
+import importlib
+import os
 import signal
-from typing import Dict, List, Optional, Any
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 
+import psutil
+
 import dspy
 
 from .config import DSPYBossConfig, load_full_config
@@ -61,6 +67,10 @@ class DSPYBoss:
         self.is_running = False
         self.is_autonomous = False  # NEW: Track autonomous mode
         self.start_time: Optional[datetime] = None
+        self._start_time_iso: Optional[str] = None
+        self._start_mono = 0.0  # time.monotonic() at start, for uptime
+        self._stop_event: Optional[asyncio.Event] = None  # Created in start(); set by signals and at the end of shutdown()
+        self._status_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # name -> (monotonic, status) for UI polls
         
         # Background tasks
         self.background_tasks: List[asyncio.Task] = []
@@ -71,11 +81,14 @@ class DSPYBoss:
         # Setup DSPY (will be replaced by LLM manager)
         self._setup_dspy()
         
-        # Setup signal handlers
-        self._setup_signal_handlers()
-        
         # Initialize autonomous configuration
         self.autonomous_config = AutonomousConfig()
+        self.llm_manager.configure_semantic_cache(
+            self.autonomous_config.semantic_cache_threshold,
+            self.autonomous_config.semantic_cache_embedding_model,
+            self.autonomous_config.semantic_cache_embedding_api_key,
+            self.autonomous_config.semantic_cache_embedding_api_base
+        )
         
         logger.info(f"DSPY Boss initialized with {len(self.config.mcp_servers)} MCP servers, "
                    f"{len(self.config.agents)} agents, and {len(self.config.prompt_signatures)} prompt signatures")
@@ -106,11 +119,23 @@ class DSPYBoss:
     def _setup_dspy(self):
         """Setup DSPY configuration"""
         try:
+            # Identical requests (model + messages + params) are answered from disk, across restarts too
+            if self.config.dspy_cache_enabled:
+                cache_dir = self.config.data_dir / "dspy_cache"
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                dspy.configure_cache(
+                    enable_disk_cache=True,
+                    enable_memory_cache=True,
+                    disk_cache_dir=str(cache_dir),
+                    disk_size_limit_bytes=self.config.dspy_cache_size_mb * 1024 * 1024
+                )
+            
             # Configure DSPY with default LLM
             lm = dspy.LM(
                 model=self.config.dspy_model,
                 max_tokens=self.config.dspy_max_tokens,
-                temperature=self.config.dspy_temperature
+                temperature=self.config.dspy_temperature,
+                cache=self.config.dspy_cache_enabled
             )
             dspy.configure(lm=lm)
             
@@ -120,13 +145,20 @@ class DSPYBoss:
             logger.warning(f"Error configuring DSPY: {e}. Using default configuration.")
     
     def _setup_signal_handlers(self):
-        """Setup signal handlers for graceful shutdown"""
-        def signal_handler(signum, frame):
+        """Setup signal handlers for graceful shutdown, on the running loop"""
+        loop = asyncio.get_running_loop()
+        
+        def signal_handler(signum):
             logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            asyncio.create_task(self.shutdown())
+            # Only wake run_forever; its finally runs shutdown() to completion before asyncio.run exits
+            self._stop_event.set()
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, signal_handler, signum)
+            except NotImplementedError:
+                # Windows loops have no add_signal_handler; hop onto the loop from the handler
+                signal.signal(signum, lambda num, frame: loop.call_soon_threadsafe(signal_handler, num))
     
     async def start(self):
         """Start the DSPY Boss system"""
@@ -136,6 +168,12 @@ class DSPYBoss:
         
         logger.info("Starting DSPY Boss system...")
         self.start_time = datetime.utcnow()
+        self._start_time_iso = self.start_time.isoformat()
+        self._start_mono = time.monotonic()
+        self._stop_event = asyncio.Event()
+        
+        # Needs the running loop, so it can't happen in __init__
+        self._setup_signal_handlers()
         
         try:
             # Initialize state machine
@@ -154,6 +192,9 @@ class DSPYBoss:
             # Load and start agents
             self.agent_manager.load_agents(self.config.agents, self.config.prompt_signatures)
             
+            # Prime the CPU counter so the first metrics sample has a baseline to diff against
+            psutil.cpu_percent(interval=None)
+            
             # Start background tasks
             await self._start_background_tasks()
             
@@ -186,9 +227,10 @@ class DSPYBoss:
         
         if self.background_tasks:
             await asyncio.gather(*self.background_tasks, return_exceptions=True)
+            self.background_tasks.clear()
         
         # Stop agents
-        self.agent_manager.stop_all_agents()
+        await self.agent_manager.stop_all_agents()
         
         # Stop task manager
         await self.task_manager.stop()
@@ -197,6 +239,8 @@ class DSPYBoss:
         await self.mcp_manager.shutdown()
         
         logger.info("DSPY Boss system shutdown complete")
+        # Set last, so run_forever only returns once cleanup has finished
+        self._stop_event.set()
     
     def _register_task_functions(self):
         """Register available task functions"""
@@ -212,22 +256,16 @@ class DSPYBoss:
     
     async def _start_background_tasks(self):
         """Start background monitoring and management tasks"""
+        loops = (
+            ("boss.health", self._health_monitoring_loop),
+            ("boss.workload", self._workload_management_loop),
+            ("boss.reflection", self._reflection_loop),
+            ("boss.metrics", self._metrics_collection_loop),
+        )
         
-        # Health monitoring task
-        health_task = asyncio.create_task(self._health_monitoring_loop())
-        self.background_tasks.append(health_task)
-        
-        # Workload management task
-        workload_task = asyncio.create_task(self._workload_management_loop())
-        self.background_tasks.append(workload_task)
-        
-        # Reflection task
-        reflection_task = asyncio.create_task(self._reflection_loop())
-        self.background_tasks.append(reflection_task)
-        
-        # Metrics collection task
-        metrics_task = asyncio.create_task(self._metrics_collection_loop())
-        self.background_tasks.append(metrics_task)
+        # Named so they can be told apart in asyncio debug output and task dumps
+        for name, loop in loops:
+            self.background_tasks.append(asyncio.create_task(loop(), name=name))
         
         logger.info("Started background tasks")
     
@@ -267,12 +305,14 @@ class DSPYBoss:
                 
                 # Check if we need to spawn new agents
                 if pending_tasks >= self.config.agent_spawn_threshold:
-                    available_agents = len([
-                        a for a in self.agent_manager.agents.values() 
-                        if a.config.is_available and len(a.current_tasks) < a.config.max_concurrent_tasks
-                    ])
+                    # Only agents in the live available set can take work; stop at the first with capacity
+                    agents = self.agent_manager.agents
+                    has_capacity = any(
+                        len(agents[agent_id].current_tasks) < agents[agent_id].config.max_concurrent_tasks
+                        for agent_id in self.agent_manager.available
+                    )
                     
-                    if available_agents == 0:
+                    if not has_capacity:
                         logger.info(f"High workload ({pending_tasks} tasks), spawning new agent")
                         self.agent_manager.spawn_agentic_agent()
                 
@@ -346,8 +386,6 @@ class DSPYBoss:
     async def _collect_system_metrics(self) -> SystemMetrics:
         """Collect current system metrics"""
         try:
-            import psutil
-            
             # Task metrics
             task_stats = self.task_manager.get_stats()
             
@@ -355,7 +393,7 @@ class DSPYBoss:
             agent_stats = self.agent_manager.get_agent_stats()
             
             # System metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)  # Since the previous call; never blocks
             memory = psutil.virtual_memory()
             
             # MCP metrics
@@ -416,13 +454,13 @@ class DSPYBoss:
     
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status"""
-        uptime = (datetime.utcnow() - self.start_time).total_seconds() if self.start_time else 0
+        uptime = time.monotonic() - self._start_mono if self.start_time else 0
         
         return {
             "system": {
                 "is_running": self.is_running,
                 "uptime_seconds": uptime,
-                "start_time": self.start_time.isoformat() if self.start_time else None,
+                "start_time": self._start_time_iso,
                 "version": self.config.version
             },
             "state_machine": self.state_manager.get_status(),
@@ -455,59 +493,13 @@ class DSPYBoss:
         await self.start()
         
         try:
-            while self.is_running:
-                await asyncio.sleep(1)
+            # Sleeps until a signal or a completed shutdown() sets the event
+            await self._stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
         finally:
             await self.shutdown()
 
-
-# Convenience function for running the system
-async def run_dspy_boss(config_dir: str = "configs", dry_run: bool = False):
-    """Run DSPY Boss system"""
-    boss = DSPYBoss(config_dir)
-    
-    if dry_run:
-        logger.info("Dry run mode - testing initialization only")
-        await boss.start()
-        
-        # Add a sample task
-        task_id = await boss.add_task(
-            name="Sample Research Task",
-            description="Research the latest trends in AI",
-            function_name="research",
-            parameters={"query": "AI trends 2024", "depth": "basic"},
-            priority=TaskPriority.MEDIUM
-        )
-        
-        logger.info(f"Added sample task: {task_id}")
-        
-        # Wait a bit to see system in action
-        await asyncio.sleep(10)
-        
-        # Show status
-        status = boss.get_system_status()
-        logger.info(f"System status: {status}")
-        
-        await boss.shutdown()
-    else:
-        await boss.run_forever()
-
-
-if __name__ == "__main__":
-    import sys
-    
-    dry_run = "--dry-run" in sys.argv
-    config_dir = "configs"
-    
-    # Check for config directory argument
-    for i, arg in enumerate(sys.argv):
-        if arg == "--config" and i + 1 < len(sys.argv):
-            config_dir = sys.argv[i + 1]
-    
-    asyncio.run(run_dspy_boss(config_dir, dry_run))
-
     # ============= NEW AUTONOMOUS METHODS =============
     
     async def start_autonomous_mode(self):
@@ -527,6 +519,7 @@ if __name__ == "__main__":
         # Start autonomous engine
         await self.autonomous_engine.start_autonomous_operation()
         self.is_autonomous = True
+        self._status_cache.clear()
         
         # Update system state
         self.state_holder.update_current_state({
@@ -548,6 +541,7 @@ if __name__ == "__main__":
         
         await self.autonomous_engine.stop_autonomous_operation()
         self.is_autonomous = False
+        self._status_cache.clear()
         
         # Update system state
         self.state_holder.update_current_state({
@@ -563,19 +557,34 @@ if __name__ == "__main__":
             from .llm_providers import LLMProvider
             provider_enum = LLMProvider(provider.lower())
             self.llm_manager.set_api_key(provider_enum, api_key)
+            self._status_cache.pop("llm_providers", None)
+            self._status_cache.pop("autonomous", None)
             logger.info(f"🔑 API key set for {provider}")
             return True
         except ValueError:
             logger.error(f"❌ Unknown provider: {provider}")
             return False
             
+    def _cached_status(self, name: str, build: Callable[[], Dict[str, Any]], ttl: float = 1.0) -> Dict[str, Any]:
+        """Return the status dict built less than ``ttl`` seconds ago, rebuilding it otherwise.
+
+        Callers get a shallow copy, so adding keys to it cannot leak into the cache.
+        """
+        now = time.monotonic()
+        cached = self._status_cache.get(name)
+        if cached and now - cached[0] < ttl:
+            return cached[1].copy()
+        status = build()
+        self._status_cache[name] = (now, status)
+        return status.copy()
+        
     def get_llm_provider_status(self) -> Dict[str, Any]:
         """Get status of all LLM providers"""
-        return self.llm_manager.get_provider_status()
+        return self._cached_status("llm_providers", self.llm_manager.get_provider_status)
         
     def get_agent_hierarchy_status(self) -> Dict[str, Any]:
         """Get agent hierarchy status with proper numbering"""
-        return self.autonomous_engine.agent_hierarchy.get_all_statuses()
+        return self._cached_status("agent_hierarchy", self.autonomous_engine.agent_hierarchy.get_all_statuses)
         
     def get_agent_display_info(self) -> List[Dict[str, Any]]:
         """Get agent info for UI display (Boss = Agent 0, others = Agent 1, 2, 3...)"""
@@ -583,6 +592,9 @@ if __name__ == "__main__":
         
     def get_autonomous_status(self) -> Dict[str, Any]:
         """Get autonomous operation status"""
+        return self._cached_status("autonomous", self._build_autonomous_status)
+        
+    def _build_autonomous_status(self) -> Dict[str, Any]:
         current_context = self.autonomous_engine.current_context
         
         return {
@@ -603,3 +615,74 @@ if __name__ == "__main__":
             "llm_config": self.llm_manager.export_config(),
         }
 
+
+def install_event_loop_policy():
+    """Pick the event loop before asyncio.run: DSPY_BOSS_LOOP_POLICY, then uvloop, then the default.
+
+    DSPY_BOSS_LOOP_POLICY names a "module:PolicyClass" to try first, e.g. an io_uring-backed loop.
+    """
+    if sys.platform == "win32":
+        return
+    
+    custom = os.getenv("DSPY_BOSS_LOOP_POLICY")
+    if custom:
+        module_name, _, policy_name = custom.partition(":")
+        try:
+            policy_cls = getattr(importlib.import_module(module_name), policy_name or "EventLoopPolicy")
+            asyncio.set_event_loop_policy(policy_cls())
+            logger.info(f"Using event loop policy {custom}")
+            return
+        except (ImportError, AttributeError) as e:
+            logger.warning(f"Event loop policy {custom} unavailable ({e}), falling back to uvloop")
+    
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+# Convenience function for running the system
+async def run_dspy_boss(config_dir: str = "configs", dry_run: bool = False):
+    """Run DSPY Boss system"""
+    boss = DSPYBoss(config_dir)
+    
+    if dry_run:
+        logger.info("Dry run mode - testing initialization only")
+        await boss.start()
+        
+        # Add a sample task
+        task_id = await boss.add_task(
+            name="Sample Research Task",
+            description="Research the latest trends in AI",
+            function_name="research",
+            parameters={"query": "AI trends 2024", "depth": "basic"},
+            priority=TaskPriority.MEDIUM
+        )
+        
+        logger.info(f"Added sample task: {task_id}")
+        
+        # Wait a bit to see system in action
+        await asyncio.sleep(10)
+        
+        # Show status
+        status = boss.get_system_status()
+        logger.info(f"System status: {status}")
+        
+        await boss.shutdown()
+    else:
+        await boss.run_forever()
+
+
+if __name__ == "__main__":
+    dry_run = "--dry-run" in sys.argv
+    config_dir = "configs"
+    
+    # Check for config directory argument
+    for i, arg in enumerate(sys.argv):
+        if arg == "--config" and i + 1 < len(sys.argv):
+            config_dir = sys.argv[i + 1]
+    
+    install_event_loop_policy()
+    asyncio.run(run_dspy_boss(config_dir, dry_run))
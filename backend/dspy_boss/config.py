@@ -48,6 +48,8 @@ class DSPYBossConfig(BaseModel):
     dspy_model: str = Field(default="gpt-3.5-turbo")
     dspy_max_tokens: int = Field(default=1000)
     dspy_temperature: float = Field(default=0.7)
+    dspy_cache_enabled: bool = Field(default=True)  # Persist LM responses across restarts
+    dspy_cache_size_mb: int = Field(default=1024)
     
     # File paths
     config_dir: Path = Field(default=Path("configs"))
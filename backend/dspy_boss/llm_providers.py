@@ -5,12 +5,14 @@ LLM Provider Manager - Handles multiple LLM providers with API key management
 
 import os
 import asyncio
+import threading
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 from loguru import logger
 
 import dspy
+import numpy as np
 from dspy.teleprompt import BootstrapFewShot
 
 
@@ -33,6 +35,102 @@ class LLMConfig:
     is_active: bool = True
 
 
+class SemanticCacheLM(dspy.LM):
+    """dspy.LM that answers near-duplicate prompts from earlier completions.
+
+    Each prompt is embedded (identical prompts reuse the embedding) and compared with recent
+    prompts sent with the same call parameters; a cosine similarity at or above ``threshold``
+    returns the stored completion. Otherwise the call falls through to dspy.LM and its
+    exact-match cache, as it does when embedding fails.
+    
+    The embedder has its own credentials: the chat provider's key and base URL are not
+    reused, since the embedding model is usually served by a different provider. Without
+    them the embedding provider's environment variables apply (e.g. OPENAI_API_KEY).
+    """
+    
+    def __init__(self, *args, threshold: float = 0.95, embedding_model: str = "openai/text-embedding-3-small",
+                 embedding_api_key: Optional[str] = None, embedding_api_base: Optional[str] = None,
+                 embedder: Optional[Any] = None, max_entries: int = 1024, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        if embedder is None:
+            credentials = {"api_key": embedding_api_key, "api_base": embedding_api_base}
+            embedder = dspy.Embedder(
+                embedding_model, caching=True, **{k: v for k, v in credentials.items() if v}
+            )
+        self.embedder = embedder  # Callable on text, with an async acall() for aforward()
+        
+        # Ring of unit-normalised prompt embeddings; row i pairs with _entries[i]
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Optional[tuple]] = [None] * max_entries  # (call params, completion)
+        self._next = 0
+        self._lock = threading.Lock()  # forward() runs on executor threads, aforward() on the loop
+        
+    def forward(self, prompt=None, messages=None, **kwargs):
+        text, params = self._cache_key(prompt, messages, kwargs)
+        try:
+            vector = self._normalise(self.embedder(text))
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed, calling the model uncached: {e}")
+            return super().forward(prompt=prompt, messages=messages, **kwargs)
+        completion = self._lookup(vector, params)
+        if completion is None:
+            completion = super().forward(prompt=prompt, messages=messages, **kwargs)
+            self._store(vector, params, completion)
+        return completion
+        
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        text, params = self._cache_key(prompt, messages, kwargs)
+        try:
+            vector = self._normalise(await self.embedder.acall(text))
+        except Exception as e:
+            logger.warning(f"Semantic cache embedding failed, calling the model uncached: {e}")
+            return await super().aforward(prompt=prompt, messages=messages, **kwargs)
+        completion = self._lookup(vector, params)
+        if completion is None:
+            completion = await super().aforward(prompt=prompt, messages=messages, **kwargs)
+            self._store(vector, params, completion)
+        return completion
+        
+    @staticmethod
+    def _cache_key(prompt, messages, kwargs) -> tuple:
+        """Text to embed and the call parameters a cached completion must match"""
+        if messages is not None:
+            text = "\n".join(str(message.get("content", "")) for message in messages)
+        else:
+            text = str(prompt)
+        return text, repr(sorted(kwargs.items()))
+        
+    @staticmethod
+    def _normalise(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        return vector
+        
+    def _lookup(self, vector: np.ndarray, params: str):
+        """Stored completion for the closest prompt above the threshold, or None"""
+        with self._lock:
+            if self._vectors is None:
+                return None
+            scores = self._vectors @ vector
+            for row in np.argsort(scores)[::-1]:
+                if scores[row] < self.threshold:
+                    break
+                entry = self._entries[row]
+                if entry is not None and entry[0] == params:
+                    return entry[1]
+        return None
+        
+    def _store(self, vector: np.ndarray, params: str, completion):
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            self._vectors[self._next] = vector
+            self._entries[self._next] = (params, completion)
+            self._next = (self._next + 1) % self.max_entries
+
+
 class LLMProviderManager:
     """Manages multiple LLM providers with API key configuration"""
     
@@ -41,6 +139,12 @@ class LLMProviderManager:
         self.active_provider: Optional[LLMProvider] = None
         self.initialized_models: Dict[LLMProvider, Any] = {}
         
+        # Off unless configure_semantic_cache() sets a threshold
+        self.semantic_cache_threshold: Optional[float] = None
+        self.semantic_cache_embedding_model = "openai/text-embedding-3-small"
+        self.semantic_cache_embedding_api_key: Optional[str] = None
+        self.semantic_cache_embedding_api_base: Optional[str] = None
+        
         # Initialize with default configurations
         self._setup_default_configs()
         
@@ -120,6 +224,31 @@ class LLMProviderManager:
         else:
             logger.error(f"❌ Unknown provider: {provider}")
             
+    def configure_semantic_cache(self, threshold: Optional[float], embedding_model: Optional[str] = None,
+                                 embedding_api_key: Optional[str] = None,
+                                 embedding_api_base: Optional[str] = None):
+        """Enable (threshold in (0, 1]) or disable (None) near-duplicate prompt caching for new models
+        
+        The embedding credentials are separate from every chat provider's.
+        """
+        self.semantic_cache_threshold = threshold
+        if embedding_model:
+            self.semantic_cache_embedding_model = embedding_model
+        self.semantic_cache_embedding_api_key = embedding_api_key
+        self.semantic_cache_embedding_api_base = embedding_api_base
+            
+    def _make_lm(self, **kwargs) -> dspy.LM:
+        """Build a provider model, layering the semantic cache on when it is enabled"""
+        if self.semantic_cache_threshold is None:
+            return dspy.LM(**kwargs)
+        return SemanticCacheLM(
+            threshold=self.semantic_cache_threshold,
+            embedding_model=self.semantic_cache_embedding_model,
+            embedding_api_key=self.semantic_cache_embedding_api_key,
+            embedding_api_base=self.semantic_cache_embedding_api_base,
+            **kwargs
+        )
+        
     async def _initialize_provider(self, provider: LLMProvider):
         """Initialize a specific provider"""
         try:
@@ -130,7 +259,7 @@ class LLMProviderManager:
                 return False
                 
             if provider == LLMProvider.OPENAI:
-                model = dspy.LM(
+                model = self._make_lm(
                     model=f"openai/{config.model}",
                     api_key=config.api_key,
                     max_tokens=config.max_tokens,
@@ -139,7 +268,7 @@ class LLMProviderManager:
                 
             elif provider == LLMProvider.GROK:
                 # Grok uses OpenAI-compatible API
-                model = dspy.LM(
+                model = self._make_lm(
                     model=f"openai/{config.model}",
                     api_key=config.api_key,
                     api_base=config.base_url,
@@ -149,7 +278,7 @@ class LLMProviderManager:
                 
             elif provider == LLMProvider.OLLAMA:
                 # Ollama integration
-                model = dspy.LM(
+                model = self._make_lm(
                     model=f"ollama/{config.model}",
                     api_base=config.base_url,
                     max_tokens=config.max_tokens,
@@ -158,7 +287,7 @@ class LLMProviderManager:
                 
             elif provider == LLMProvider.GOOGLE:
                 # Google AI integration
-                model = dspy.LM(
+                model = self._make_lm(
                     model=f"google/{config.model}",
                     api_key=config.api_key,
                     max_tokens=config.max_tokens,
@@ -167,7 +296,7 @@ class LLMProviderManager:
                 
             elif provider == LLMProvider.OPENROUTER:
                 # OpenRouter uses OpenAI-compatible API
-                model = dspy.LM(
+                model = self._make_lm(
                     model=f"openrouter/{config.model}",
                     api_key=config.api_key,
                     api_base=config.base_url,
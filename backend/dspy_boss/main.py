@@ -9,7 +9,7 @@ import sys
 from pathlib import Path
 from loguru import logger
 
-from .boss import run_dspy_boss
+from .boss import install_event_loop_policy, run_dspy_boss
 
 
 def main():
@@ -54,6 +54,7 @@ def main():
     
     try:
         # Run the system
+        install_event_loop_policy()
         asyncio.run(run_dspy_boss(args.config_dir, args.dry_run))
         
     except KeyboardInterrupt:
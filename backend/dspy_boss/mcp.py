@@ -210,6 +210,9 @@ class MCPManager:
         self.health_check_task: Optional[asyncio.Task] = None
         self.health_check_interval = 300  # 5 minutes
         
+        # Capability -> names of servers with a connection, rebuilt after servers change
+        self._capability_index: Optional[Dict[str, List[str]]] = None
+        
     async def initialize(self):
         """Initialize all MCP connections"""
         logger.info(f"Initializing {len(self.servers)} MCP server connections...")
@@ -224,6 +227,8 @@ class MCPManager:
                 if not success:
                     logger.warning(f"Failed to connect to MCP server: {name}")
         
+        self.invalidate_capability_cache()
+        
         # Start health check task
         self.health_check_task = asyncio.create_task(self._health_check_loop())
         
@@ -246,6 +251,7 @@ class MCPManager:
             await connection.disconnect()
         
         self.connections.clear()
+        self.invalidate_capability_cache()
         logger.info("MCP connections shutdown complete")
     
     async def send_request(self, server_name: str, method: str, endpoint: str, data: Optional[Dict] = None) -> MCPResponse:
@@ -295,6 +301,15 @@ class MCPManager:
         
         return results
     
+    async def get_snapshot(self, endpoint: str = "status") -> Dict[str, Any]:
+        """Fetch every connected server's data in one concurrent round, with connection stats"""
+        responses = await self.broadcast_request("GET", endpoint)
+        return {
+            "data": {name: r.data for name, r in responses.items() if r.success},
+            "errors": {name: r.error for name, r in responses.items() if not r.success},
+            "status": self.get_server_stats()
+        }
+    
     async def _health_check_loop(self):
         """Periodic health check for all connections"""
         while True:
@@ -340,11 +355,23 @@ class MCPManager:
     
     def find_servers_by_capability(self, capability: str) -> List[str]:
         """Find servers that have a specific capability"""
-        matching_servers = []
-        for name, config in self.servers.items():
-            if capability in config.capabilities and name in self.connections and self.connections[name].is_connected:
-                matching_servers.append(name)
-        return matching_servers
+        if self._capability_index is None:
+            index: Dict[str, List[str]] = {}
+            for name, config in self.servers.items():
+                if name in self.connections:
+                    for server_capability in config.capabilities:
+                        index.setdefault(server_capability, []).append(name)
+            self._capability_index = index
+        
+        # Connection state changes on its own, so it is checked on every lookup
+        return [
+            name for name in self._capability_index.get(capability, ())
+            if self.connections[name].is_connected
+        ]
+    
+    def invalidate_capability_cache(self):
+        """Drop the capability index after servers are added or removed"""
+        self._capability_index = None
     
     async def add_server(self, name: str, config: MCPServerConfig):
         """Add a new MCP server at runtime"""
@@ -353,6 +380,7 @@ class MCPManager:
         if config.is_active:
             connection = MCPConnection(config)
             self.connections[name] = connection
+            self.invalidate_capability_cache()
             
             success = await connection.connect()
             if success:
@@ -369,6 +397,7 @@ class MCPManager:
         if name in self.servers:
             del self.servers[name]
         
+        self.invalidate_capability_cache()
         logger.info(f"Removed MCP server: {name}")
 
 
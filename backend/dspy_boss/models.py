@@ -6,7 +6,7 @@ Pydantic BaseModel classes for the DSPY Boss system
 from typing import Dict, List, Optional, Any, Union, Literal
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 import uuid
 
 
@@ -150,6 +150,9 @@ class TaskDefinition(BaseModel):
     error_message: Optional[str] = None
     retry_count: int = Field(default=0)
     max_retries: int = Field(default=3)
+    
+    # Frozen required_capabilities, filled in lazily by agents._required_capabilities
+    _req_caps_frozen: Optional[frozenset] = PrivateAttr(default=None)
 
 
 class MCPServerConfig(BaseModel):
@@ -386,3 +389,7 @@ class AutonomousConfig(BaseModel):
     fallback_llm_provider: Optional[str] = None
     signature_optimization: bool = Field(default=True)
     retrieval_augmented: bool = Field(default=True)
+    semantic_cache_threshold: Optional[float] = None  # Cosine similarity for reusing a completion; None disables
+    semantic_cache_embedding_model: str = Field(default="openai/text-embedding-3-small")
+    semantic_cache_embedding_api_key: Optional[str] = None  # Not shared with the chat providers
+    semantic_cache_embedding_api_base: Optional[str] = None
@@ -5,6 +5,7 @@ Self-diagnosis system using DSPY's native Python interpreter
 
 import asyncio
 import sys
+import time
 import traceback
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
@@ -34,6 +35,11 @@ class SelfDiagnosisSystem:
         self.metrics_history: List[SystemMetrics] = []
         self.max_metrics_history = 1000
         
+        # Last get_current_metrics() sample, shared by callers within the TTL
+        self._current_metrics: Optional[SystemMetrics] = None
+        self._current_metrics_at = 0.0
+        self.current_metrics_ttl = 1.0  # seconds
+        
         # Diagnosis templates
         self.diagnosis_templates = self._load_diagnosis_templates()
         
@@ -614,7 +620,11 @@ opt_result
             self.metrics_history = self.metrics_history[-self.max_metrics_history:]
     
     async def get_current_metrics(self) -> SystemMetrics:
-        """Get current system metrics"""
+        """Get current system metrics, sampled at most once per current_metrics_ttl"""
+        now = time.monotonic()
+        if self._current_metrics is not None and now - self._current_metrics_at < self.current_metrics_ttl:
+            return self._current_metrics
+        
         import psutil
         from datetime import datetime
         
@@ -638,6 +648,8 @@ opt_result
             mcp_response_time_avg=0.0
         )
         
+        self._current_metrics = metrics
+        self._current_metrics_at = now
         return metrics
     
     def get_health_score(self) -> float:
@@ -6,15 +6,32 @@ State Holder - Manages system state with historical tracking (100 recent + full
 import json
 import sqlite3
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, List, Optional, Any
+from collections import deque
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from enum import Enum
 from loguru import logger
 import os
 
+import orjson
+
 from .models import IterationResult, SystemState, LearningEntry
 
 
+# IterationResult fields persisted as their own JSON columns
+_RESULT_SECTIONS = ("pre_processing", "boss_decision", "execution", "next_prep", "error_info")
+
+
+def _json_default(obj: Any) -> Any:
+    """json fallback: ISO datetimes and enum values instead of their str() forms"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
 class StateHolder:
     """Manages system state with historical tracking and persistence"""
     
@@ -24,6 +41,8 @@ class StateHolder:
         
         # In-memory cache for recent states (fast access)
         self.recent_states: List[Dict[str, Any]] = []
+        # Same window pre-serialized, so prompts never re-dump unchanged states
+        self.recent_states_json: Deque[str] = deque(maxlen=max_recent_states)
         self.current_state: Dict[str, Any] = {}
         
         # Initialize database
@@ -95,6 +114,13 @@ class StateHolder:
     async def store_iteration_result(self, result: IterationResult):
         """Store complete iteration result"""
         try:
+            # Encode each section once; the database columns and the recent-states window share the bytes
+            state_dict = result.model_dump()
+            encoded = {
+                name: orjson.dumps(state_dict[name], default=_json_default) if state_dict[name] else None
+                for name in _RESULT_SECTIONS
+            }
+            
             # Store in database for persistence
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -106,19 +132,18 @@ class StateHolder:
             ''', (
                 result.iteration_id,
                 result.timestamp.isoformat(),
-                json.dumps(result.pre_processing, default=str) if result.pre_processing else None,
-                json.dumps(result.boss_decision, default=str) if result.boss_decision else None,
-                json.dumps(result.execution, default=str) if result.execution else None,
-                json.dumps(result.next_prep, default=str) if result.next_prep else None,
-                json.dumps(result.error_info, default=str) if result.error_info else None
+                *(section.decode() if section else None for section in encoded.values())
             ))
             
             conn.commit()
             conn.close()
             
             # Update in-memory cache
-            state_dict = asdict(result)
             self.recent_states.append(state_dict)
+            self.recent_states_json.append(orjson.dumps(
+                {**state_dict, **{name: orjson.Fragment(section) for name, section in encoded.items() if section}},
+                default=_json_default
+            ).decode())
             
             # Maintain max recent states
             if len(self.recent_states) > self.max_recent_states:
@@ -135,6 +160,10 @@ class StateHolder:
             return self.recent_states.copy()
         return self.recent_states[-count:] if count <= len(self.recent_states) else self.recent_states.copy()
         
+    def get_recent_states_json(self) -> str:
+        """Get the recent states window as a JSON array, serializing nothing new"""
+        return "[" + ",".join(self.recent_states_json) + "]"
+        
     def get_recent_iteration_results(self, count: int = 5) -> Dict[str, Any]:
         """Get results from recent iterations"""
         recent = self.get_recent_states(count)
@@ -234,7 +263,7 @@ class StateHolder:
                 VALUES (?, ?, ?, ?)
             ''', (
                 "iteration_analysis",
-                json.dumps(learning_data, default=str),
+                json.dumps(learning_data, default=_json_default),
                 learning_data.get("iteration_id", 0),
                 datetime.now().isoformat()
             ))
@@ -265,7 +294,7 @@ class StateHolder:
                 VALUES (?, ?, ?)
             ''', (
                 "error_analysis",
-                json.dumps(error_data, default=str),
+                json.dumps(error_data, default=_json_default),
                 datetime.now().isoformat()
             ))
             
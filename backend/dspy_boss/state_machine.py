@@ -187,9 +187,9 @@ class StateMachineManager:
         """Get current state"""
         return self.transition.current_state
     
-    def get_state_data(self) -> Dict[str, Any]:
-        """Get current state data"""
-        return self.transition.state_data.model_dump()
+    def get_state_data(self, mode: str = "python") -> Dict[str, Any]:
+        """Get current state data (mode="json" dumps JSON-ready values)"""
+        return self.transition.state_data.model_dump(mode=mode)
         
     def setup_default_callbacks(self):
         """Setup default callbacks for state transitions"""
@@ -5,8 +5,9 @@ Task management using built-in asyncio.Queue for robust task processing
 
 import asyncio
 import threading
+import time
 import uuid
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, Iterator, List, Optional, Callable, Any
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
@@ -34,8 +35,8 @@ class TaskExecutor:
         
     async def execute_task(self, task: TaskDefinition) -> TaskResult:
         """Execute a single task"""
-        start_time = datetime.utcnow()
-        task.started_at = start_time
+        t0 = time.monotonic_ns()
+        task.started_at = datetime.utcnow()
         task.status = TaskStatus.RUNNING
         
         logger.info(f"Executing task: {task.name} (ID: {task.id})")
@@ -56,7 +57,7 @@ class TaskExecutor:
                 result = await self._execute_function(function, task.parameters)
             
             # Task completed successfully
-            duration = (datetime.utcnow() - start_time).total_seconds()
+            duration = (time.monotonic_ns() - t0) / 1e9
             task.completed_at = datetime.utcnow()
             task.status = TaskStatus.COMPLETED
             task.result = result
@@ -72,11 +73,11 @@ class TaskExecutor:
             
         except asyncio.TimeoutError:
             error_msg = f"Task timed out after {task.timeout} seconds"
-            return self._handle_task_error(task, error_msg, start_time)
+            return self._handle_task_error(task, error_msg, t0)
             
         except Exception as e:
             error_msg = f"Task execution error: {str(e)}"
-            return self._handle_task_error(task, error_msg, start_time)
+            return self._handle_task_error(task, error_msg, t0)
     
     async def _execute_function(self, function: Callable, parameters: Dict[str, Any]) -> Any:
         """Execute function with parameters"""
@@ -88,9 +89,9 @@ class TaskExecutor:
             with ThreadPoolExecutor() as executor:
                 return await loop.run_in_executor(executor, lambda: function(**parameters))
     
-    def _handle_task_error(self, task: TaskDefinition, error_msg: str, start_time: datetime) -> TaskResult:
-        """Handle task execution error"""
-        duration = (datetime.utcnow() - start_time).total_seconds()
+    def _handle_task_error(self, task: TaskDefinition, error_msg: str, t0: int) -> TaskResult:
+        """Handle task execution error; ``t0`` is the ``time.monotonic_ns()`` start"""
+        duration = (time.monotonic_ns() - t0) / 1e9
         task.completed_at = datetime.utcnow()
         task.status = TaskStatus.FAILED
         task.error_message = error_msg
@@ -138,6 +139,8 @@ class TaskManager:
         self.completed_count = 0
         self.failed_count = 0
         self.start_time = datetime.utcnow()
+        self._start_ns = time.monotonic_ns()  # Throughput/duration math stays on the monotonic clock
+        self._total_duration = 0.0
         
         logger.info(f"TaskManager initialized with {workers} workers")
     
@@ -215,9 +218,15 @@ class TaskManager:
                 if result.success:
                     self.completed_tasks[task.id] = task
                     self.stats["completed_tasks"] += 1
+                    self.completed_count += 1
                 else:
                     self.failed_tasks[task.id] = task
                     self.stats["failed_tasks"] += 1
+                    self.failed_count += 1
+                self._total_duration += result.duration
+                finished = self.completed_count + self.failed_count
+                self.stats["average_duration"] = self._total_duration / finished
+                self.stats["tasks_per_minute"] = self.get_throughput()
                 
                 # Remove from active tasks
                 if task.id in self.tasks:
@@ -251,7 +260,12 @@ class TaskManager:
         """Get all tasks (active and completed)"""
         return list(self.tasks.values())
     
+    def iter_tasks(self) -> Iterator[TaskDefinition]:
+        """Iterate over a snapshot of all tasks, safe across awaits"""
+        return iter(tuple(self.tasks.values()))
+    
     def get_throughput(self) -> float:
         """Get tasks per minute throughput"""
         # Simple calculation - can be enhanced with time windows
-        return self.completed_count / max(1, (datetime.utcnow() - self.start_time).total_seconds() / 60) if hasattr(self, 'start_time') else 0.0
+        elapsed_minutes = (time.monotonic_ns() - self._start_ns) / 60e9
+        return self.completed_count / max(1, elapsed_minutes)
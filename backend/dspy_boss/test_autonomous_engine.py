@@ -0,0 +1,70 @@
+"""
+Test cases for the autonomous engine's DSPY output parsers
+"""
+
+import pytest
+
+from .autonomous_engine import AutonomousEngine
+
+
+@pytest.fixture
+def engine():
+    """Bare engine instance; the parsers need none of the engine's collaborators"""
+    return AutonomousEngine.__new__(AutonomousEngine)
+
+
+class TestParsePriorityTasks:
+    """Test cases for _parse_priority_tasks"""
+
+    def test_strips_list_numbering(self, engine):
+        """Test that "1. " style numbering and surrounding whitespace are removed"""
+        tasks = engine._parse_priority_tasks("1. Review logs\n  2.  Deploy fix  \n10.\tNotify team")
+
+        assert tasks == ["Review logs", "Deploy fix", "Notify team"]
+
+    def test_keeps_leading_decimal_numbers(self, engine):
+        """Test that tasks starting with a decimal number are kept whole"""
+        tasks = engine._parse_priority_tasks(
+            "1.5 million users migrate\n2.0 upgrade\n12.5% growth check"
+        )
+
+        assert tasks == ["1.5 million users migrate", "2.0 upgrade", "12.5% growth check"]
+
+    def test_skips_blank_and_comment_lines(self, engine):
+        """Test that blank lines and # comments are dropped"""
+        tasks = engine._parse_priority_tasks("# Priorities\n\n   \n1. Ship release\n  # note")
+
+        assert tasks == ["Ship release"]
+
+    def test_empty_input(self, engine):
+        """Test that empty output yields no tasks"""
+        assert engine._parse_priority_tasks("") == []
+
+
+class TestParseAgentAssignments:
+    """Test cases for _parse_agent_assignments"""
+
+    def test_parses_agent_lines(self, engine):
+        """Test that "<Agent>: <task>" lines become assignments"""
+        assignments = engine._parse_agent_assignments(
+            "Agent 1: Research competitors\n  Agent 2 :  Write summary  "
+        )
+
+        assert assignments == [
+            {"agent": "Agent 1", "task": "Research competitors"},
+            {"agent": "Agent 2", "task": "Write summary"},
+        ]
+
+    def test_ignores_text_after_second_colon(self, engine):
+        """Test that only the part between the first and second colon is the task"""
+        assignments = engine._parse_agent_assignments("Agent 3: Review: due today")
+
+        assert assignments == [{"agent": "Agent 3", "task": "Review"}]
+
+    def test_skips_lines_without_agent_or_colon(self, engine):
+        """Test that lines missing "Agent" or a colon are ignored"""
+        assignments = engine._parse_agent_assignments(
+            "Plan: gather data\nAgent 4 handles QA\nAgent 5:"
+        )
+
+        assert assignments == [{"agent": "Agent 5", "task": ""}]
@@ -0,0 +1,116 @@
+"""
+Test cases for the semantic cache layered on LLM provider models
+"""
+
+import dspy
+import pytest
+
+from .llm_providers import SemanticCacheLM
+
+
+class StubEmbedder:
+    """Embedder returning fixed vectors per prompt, or failing like an unreachable provider"""
+
+    def __init__(self, vectors, fail: bool = False):
+        self.vectors = vectors
+        self.fail = fail
+
+    def __call__(self, text):
+        if self.fail:
+            raise RuntimeError("embedding provider unreachable")
+        return self.vectors[text]
+
+    async def acall(self, text):
+        return self(text)
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    """Replace the real model call with one that records prompts and numbers its completions"""
+    calls = []
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        calls.append(prompt)
+        return f"completion {len(calls)}"
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        return forward(self, prompt=prompt, messages=messages, **kwargs)
+
+    monkeypatch.setattr(dspy.LM, "forward", forward)
+    monkeypatch.setattr(dspy.LM, "aforward", aforward)
+    return calls
+
+
+def make_lm(embedder):
+    return SemanticCacheLM("openai/gpt-4o-mini", threshold=0.9, embedder=embedder, max_entries=4)
+
+
+VECTORS = {
+    "summarise the logs": [1.0, 0.0, 0.0],
+    "summarize the logs": [0.99, 0.1, 0.0],  # Near-duplicate of the first
+    "plan the release": [0.0, 1.0, 0.0],
+}
+
+
+class TestSemanticCacheLM:
+    """Test cases for SemanticCacheLM"""
+
+    def test_near_duplicate_prompt_hits(self, model_calls):
+        """Test that a prompt close to an earlier one reuses its completion"""
+        lm = make_lm(StubEmbedder(VECTORS))
+
+        first = lm.forward(prompt="summarise the logs")
+        second = lm.forward(prompt="summarize the logs")
+
+        assert first == second == "completion 1"
+        assert model_calls == ["summarise the logs"]
+
+    def test_distinct_prompt_misses(self, model_calls):
+        """Test that a dissimilar prompt calls the model"""
+        lm = make_lm(StubEmbedder(VECTORS))
+
+        lm.forward(prompt="summarise the logs")
+        result = lm.forward(prompt="plan the release")
+
+        assert result == "completion 2"
+        assert model_calls == ["summarise the logs", "plan the release"]
+
+    def test_different_call_parameters_miss(self, model_calls):
+        """Test that a completion is only reused for the same call parameters"""
+        lm = make_lm(StubEmbedder(VECTORS))
+
+        lm.forward(prompt="summarise the logs", temperature=0.0)
+        result = lm.forward(prompt="summarise the logs", temperature=1.0)
+
+        assert result == "completion 2"
+        assert len(model_calls) == 2
+
+    def test_embedding_failure_falls_through(self, model_calls):
+        """Test that a failing embedder neither breaks the call nor caches its result"""
+        embedder = StubEmbedder(VECTORS, fail=True)
+        lm = make_lm(embedder)
+
+        assert lm.forward(prompt="summarise the logs") == "completion 1"
+
+        embedder.fail = False
+        assert lm.forward(prompt="summarise the logs") == "completion 2"
+        assert len(model_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_hit_and_miss(self, model_calls):
+        """Test that aforward uses the same cache"""
+        lm = make_lm(StubEmbedder(VECTORS))
+
+        first = await lm.aforward(prompt="summarise the logs")
+        second = await lm.aforward(prompt="summarize the logs")
+        third = await lm.aforward(prompt="plan the release")
+
+        assert first == second == "completion 1"
+        assert third == "completion 2"
+
+    @pytest.mark.asyncio
+    async def test_async_embedding_failure_falls_through(self, model_calls):
+        """Test that aforward calls the model when embedding fails"""
+        lm = make_lm(StubEmbedder(VECTORS, fail=True))
+
+        assert await lm.aforward(prompt="summarise the logs") == "completion 1"